@@ -0,0 +1,77 @@
+import pygame
+
+# Animations non bloquantes : chaque interpolation avance avec le temps écoulé
+# depuis l'image précédente (clock.tick) au lieu de boucler avec
+# pygame.time.delay, ce qui laisse la boucle principale traiter les événements.
+
+MAX_STEP = 50  # ms : une image très lente ralentit l'animation au lieu de la sauter
+
+
+class Tween:
+    def __init__(self, duration, update, on_complete=None):
+        self.duration = max(1, duration)
+        self.update = update  # Appelée avec la progression, de 0 à 1
+        self.on_complete = on_complete
+        self.elapsed = 0
+
+    def advance(self, dt):
+        self.elapsed = min(self.duration, self.elapsed + dt)
+        self.update(self.elapsed / self.duration)
+        return self.elapsed >= self.duration
+
+
+class Timeline:
+    def __init__(self):
+        self.tweens = []
+
+    def add(self, duration, update, on_complete=None):
+        tween = Tween(duration, update, on_complete)
+        self.tweens.append(tween)
+        return tween
+
+    def sequence(self, steps, on_complete=None):
+        # steps : liste de (durée, update) jouées l'une après l'autre
+        if not steps:
+            if on_complete:
+                on_complete()
+            return
+        (duration, update), rest = steps[0], steps[1:]
+        self.add(duration, update, lambda: self.sequence(rest, on_complete))
+
+    def update(self, dt):
+        dt = min(dt, MAX_STEP)
+        for tween in list(self.tweens):
+            if tween.advance(dt):
+                self.tweens.remove(tween)
+                if tween.on_complete:
+                    tween.on_complete()
+
+    def busy(self):
+        return bool(self.tweens)
+
+    def clear(self):
+        self.tweens.clear()
+
+
+class FramePacer:
+    # Cadence adaptative : 60 images/s tant que quelque chose bouge (animation,
+    # défi chronométré, survol), sinon quelques images/s seulement. Au repos,
+    # l'attente se fait dans pygame.event.wait pour repartir dès une saisie.
+    def __init__(self, active_fps=60, idle_fps=8):
+        self.clock = pygame.time.Clock()
+        self.active_fps = active_fps
+        self.idle_delay = 1000 // idle_fps
+        self.pending = []
+
+    def tick(self, active):
+        if active:
+            return self.clock.tick(self.active_fps)
+        event = pygame.event.wait(self.idle_delay)
+        if event.type != pygame.NOEVENT:
+            self.pending.append(event)
+        return self.clock.tick()
+
+    def events(self):
+        events = self.pending + pygame.event.get()
+        self.pending = []
+        return events
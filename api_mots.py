@@ -0,0 +1,122 @@
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Client unique de l'API de mots, partagé par main.py et le jeu graphique :
+# connexions gardées ouvertes dans un pool, délais stricts, mots demandés par
+# lots (number=N) et disjoncteur. Après FAILURE_THRESHOLD échecs de suite,
+# l'API n'est plus appelée pendant COOLDOWN secondes : chaque demande échoue
+# alors immédiatement et l'appelant passe au corpus local sans attendre.
+
+# Chaîne vide : pas de réseau, corpus local uniquement
+WORD_API_URL = os.environ.get("ROULETTE_WORD_API", "https://random-word-api.herokuapp.com/word")
+WORD_API_TIMEOUT = (
+    float(os.environ.get("ROULETTE_WORD_API_CONNECT_TIMEOUT", 1.0)),
+    float(os.environ.get("ROULETTE_WORD_API_READ_TIMEOUT", 2.0)),
+)
+FAILURE_THRESHOLD = 3
+COOLDOWN = 30.0
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def autorise(self):
+        # Ouvert : refus jusqu'à la fin du délai, puis un essai est laissé
+        # passer (semi-ouvert) ; un nouvel échec le rouvre aussitôt
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = None
+                self.failures = self.threshold - 1
+                return True
+            return False
+
+    def attente(self):
+        # Secondes avant le prochain essai autorisé
+        with self.lock:
+            if self.opened_at is None:
+                return 0
+            return max(0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def succes(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def echec(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class WordApiClient:
+    def __init__(self, url=WORD_API_URL, lang="fr", timeout=WORD_API_TIMEOUT, pool_size=4, batch=10, breaker=None):
+        self.url = url
+        self.lang = lang
+        self.timeout = timeout
+        self.batch = batch  # Taille des lots servis un par un par mot()
+        self.breaker = breaker or CircuitBreaker()
+        self.buffer = deque()
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rejected": 0, "words": 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def mots(self, number):
+        # Liste de mots, vide si l'API est désactivée, coupée ou en erreur
+        if not self.url:
+            return []
+        if not self.breaker.autorise():
+            self.stats["rejected"] += 1
+            return []
+        self.stats["requests"] += 1
+        try:
+            response = self.session.get(self.url, params={"number": number, "lang": self.lang}, timeout=self.timeout)
+            response.raise_for_status()
+            words = [word for word in response.json() if isinstance(word, str) and word]
+        except (requests.RequestException, ValueError) as e:
+            self.stats["errors"] += 1
+            self.breaker.echec()
+            print(f"Exception fetching words: {e}")
+            return []
+        self.breaker.succes()
+        self.stats["words"] += len(words)
+        return words
+
+    def mot(self):
+        # Un mot, tiré d'un lot déjà reçu quand c'est possible
+        with self.lock:
+            if not self.buffer:
+                self.buffer.extend(self.mots(self.batch))
+            return self.buffer.popleft() if self.buffer else None
+
+    def fermer(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client_partage():
+    # Client commun au processus, créé à la première demande
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = WordApiClient()
+        return _client
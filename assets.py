@@ -0,0 +1,211 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+# Images du jeu : chargées à la première demande, converties au format de
+# l'écran (convert_alpha) pour des blits sans conversion, et mises à
+# l'échelle une seule fois. Les variantes redimensionnées sont gardées sur
+# disque en pixels bruts (RGBA), sous une clé tirée du contenu du fichier
+# source et de la taille, et peuvent être regroupées dans un paquet unique
+# lu par mmap (python assets.py construit ce paquet).
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_CACHE = os.environ.get("ROULETTE_ASSET_CACHE", os.path.join(BASE_DIR, ".cache_images"))
+ASSET_BUNDLE = os.environ.get("ROULETTE_ASSET_BUNDLE", os.path.join(BASE_DIR, "assets.pack"))
+
+# Variantes utilisées par roulette_graphique.py, regroupées dans le paquet
+GAME_IMAGES = [
+    ("gun.png", (100, 50)),
+    ("joueur1.png", (60, 120)),
+    ("joueur2.png", (60, 120)),
+]
+
+BUNDLE_MAGIC = b"RPAK1\n"
+
+
+def variant_key(name, size):
+    return f"{name}@{size[0]}x{size[1]}" if size else name
+
+
+class AssetManager:
+    def __init__(self, base_dir=BASE_DIR, cache_dir=ASSET_CACHE, bundle_path=ASSET_BUNDLE):
+        self.base_dir = base_dir
+        self.cache_dir = cache_dir
+        self.bundle_path = bundle_path
+        self.images = {}  # (nom, taille, alpha) -> surface convertie
+        self.hashes = {}
+        self.bundle = None  # (mmap, index) ouvert à la première demande
+        self.stats = {"memory": 0, "bundle": 0, "disk": 0, "source": 0}
+
+    def path(self, name):
+        return os.path.join(self.base_dir, name)
+
+    def source_hash(self, name):
+        digest = self.hashes.get(name)
+        if digest is None:
+            path = self.path(name)
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as file:
+                digest = hashlib.sha1(file.read()).hexdigest()[:16]
+            self.hashes[name] = digest
+        return digest
+
+    def image(self, name, size=None, alpha=True):
+        # Surface prête à blitter, ou None si l'image est introuvable
+        key = (name, tuple(size) if size else None, alpha)
+        surface = self.images.get(key)
+        if surface is not None:
+            self.stats["memory"] += 1
+            return surface
+
+        digest = self.source_hash(name)
+        raw = self._from_bundle(name, key[1], digest)
+        if raw is not None:
+            self.stats["bundle"] += 1
+        elif digest is not None:
+            raw = self._from_disk(name, key[1], digest)
+            if raw is not None:
+                self.stats["disk"] += 1
+            else:
+                raw = self._from_source(name, key[1], digest)
+                self.stats["source"] += 1
+        if raw is None:
+            return None
+
+        surface = self._convert(raw, alpha)
+        self.images[key] = surface
+        return surface
+
+    def _convert(self, raw, alpha):
+        if pygame.display.get_surface() is None:
+            return raw.copy()  # Pas encore d'écran : format non converti
+        return raw.convert_alpha() if alpha else raw.convert()
+
+    def _cache_path(self, name, size, digest):
+        stem = os.path.splitext(os.path.basename(name))[0]
+        suffix = f"-{size[0]}x{size[1]}" if size else ""
+        return os.path.join(self.cache_dir, f"{stem}-{digest}{suffix}.rgba")
+
+    def _from_disk(self, name, size, digest):
+        if size is None:
+            return None
+        path = self._cache_path(name, size, digest)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        if len(data) != size[0] * size[1] * 4:
+            return None  # Fichier tronqué : on repart de la source
+        return pygame.image.frombuffer(data, size, "RGBA")
+
+    def _from_source(self, name, size, digest):
+        image = pygame.image.load(self.path(name))
+        if size is None:
+            return image
+        image = pygame.transform.scale(image, size)
+        try:
+            self._write_cache(self._cache_path(name, size, digest), pygame.image.tobytes(image, "RGBA"))
+        except OSError as e:
+            print(f"Cache d'images indisponible: {e}")
+        return image
+
+    def _write_cache(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+
+    def _open_bundle(self):
+        if self.bundle is None:
+            self.bundle = (None, {})
+            if self.bundle_path and os.path.exists(self.bundle_path):
+                try:
+                    self.bundle = read_bundle(self.bundle_path)
+                except (OSError, ValueError) as e:
+                    print(f"Paquet d'images ignoré: {e}")
+        return self.bundle
+
+    def _from_bundle(self, name, size, digest):
+        data, index = self._open_bundle()
+        entry = index.get(variant_key(name, size))
+        if entry is None:
+            return None
+        if digest is not None and entry["hash"] != digest:
+            return None  # Source modifiée depuis la construction du paquet
+        start = entry["offset"]
+        view = memoryview(data)[start:start + entry["length"]]
+        return pygame.image.frombuffer(view, tuple(entry["size"]), "RGBA")
+
+    def close(self):
+        if self.bundle and self.bundle[0] is not None:
+            self.bundle[0].close()
+        self.bundle = None
+
+
+def read_bundle(path):
+    # En-tête, longueur de l'index (uint32), index JSON, puis pixels RGBA bruts
+    with open(path, "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+        data.close()
+        raise ValueError(f"{path}: format inconnu")
+    start = len(BUNDLE_MAGIC)
+    (index_length,) = struct.unpack("<I", data[start:start + 4])
+    index = json.loads(data[start + 4:start + 4 + index_length].decode("utf-8"))
+    return data, index
+
+
+def build_bundle(path=ASSET_BUNDLE, images=GAME_IMAGES, base_dir=BASE_DIR):
+    manager = AssetManager(base_dir=base_dir, bundle_path=None)
+    blobs = []
+    index = {}
+    offset = 0
+    for name, size in images:
+        digest = manager.source_hash(name)
+        if digest is None:
+            print(f"Image introuvable: {name}")
+            continue
+        image = manager._from_source(name, size, digest)
+        blob = pygame.image.tobytes(image, "RGBA")
+        index[variant_key(name, size)] = {
+            "offset": offset, "length": len(blob), "size": list(image.get_size()), "hash": digest
+        }
+        blobs.append(blob)
+        offset += len(blob)
+
+    # Les décalages de l'index sont relatifs au début des données : on les
+    # rend absolus une fois la taille de l'index connue (point fixe)
+    data_start = 0
+    while True:
+        header = json.dumps({key: dict(entry, offset=entry["offset"] + data_start) for key, entry in index.items()}).encode("utf-8")
+        start = len(BUNDLE_MAGIC) + 4 + len(header)
+        if start == data_start:
+            break
+        data_start = start
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(BUNDLE_MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+ASSETS = AssetManager()
+
+
+if __name__ == "__main__":
+    pygame.init()
+    target = sys.argv[1] if len(sys.argv) > 1 else ASSET_BUNDLE
+    print(f"Paquet écrit: {build_bundle(target)}")
@@ -0,0 +1,45 @@
+import random
+
+BLOCK = 6
+
+
+class Barillet:
+    # Barillet décrit par des compteurs au lieu d'une liste de chambres.
+    # Il reproduit init_barillet(nb_balles) pour nb_balles <= 6, et au-delà
+    # l'enchaînement de blocs init_barillet(6) puis init_barillet(reste) de
+    # start_game_with_nicknames() : les blocs pleins sont entièrement chargés,
+    # et seul le dernier bloc est tiré au sort, chambre par chambre au moment
+    # du tir (une chambre est chargée avec la probabilité balles restantes /
+    # chambres restantes, ce qui revient à un mélange uniforme du bloc).
+    # Mémoire et coût par tir constants, quel que soit le nombre de balles.
+    def __init__(self, nb_balles=1, rng=random):
+        self.rng = rng
+        if nb_balles <= BLOCK:
+            # Comme [0] * (6 - nb_balles) + [1] * nb_balles
+            self.pleines = 0
+            self.chambres = (BLOCK - nb_balles) + max(nb_balles, 0)
+            self.chargees = max(nb_balles, 0)
+        else:
+            blocs, reste = divmod(nb_balles, BLOCK)
+            self.pleines = blocs * BLOCK  # Chambres des blocs pleins, toutes chargées
+            self.chambres = BLOCK if reste else 0
+            self.chargees = reste
+
+    def __len__(self):
+        return self.pleines + self.chambres
+
+    def balles(self):
+        return self.pleines + self.chargees
+
+    def tirer(self):
+        # True si la chambre tirée était chargée ; IndexError si vide, comme pop(0)
+        if self.pleines:
+            self.pleines -= 1
+            return True
+        if not self.chambres:
+            raise IndexError("tirer dans un barillet vide")
+        chargee = self.rng.randrange(self.chambres) < self.chargees
+        self.chambres -= 1
+        if chargee:
+            self.chargees -= 1
+        return chargee
@@ -0,0 +1,196 @@
+import mmap
+import os
+import random
+import struct
+
+# Corpus local de mots français. La liste source (mots_fr.txt) est compilée
+# une fois en un fichier binaire compact, ouvert par mmap à la première
+# demande : les mots y sont rangés par seau (classe de longueur, difficulté)
+# derrière une table de décalages, si bien que tirer un mot au hasard dans un
+# seau coûte deux lectures, sans charger la liste en objets Python.
+#
+# Format : en-tête, (nb_seaux, nb_mots), table des seaux
+# (longueur, difficulté, premier mot, nombre de mots), nb_mots + 1 décalages
+# uint32, puis les mots en UTF-8 mis bout à bout.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_SOURCE = os.path.join(BASE_DIR, "mots_fr.txt")
+CORPUS_FILE = os.environ.get("ROULETTE_CORPUS", os.path.join(BASE_DIR, "mots_fr.bin"))
+# Repli quand le dossier du jeu n'est pas accessible en écriture
+CORPUS_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "roulette", "mots_fr.bin")
+
+CORPUS_MAGIC = b"RMOT1\n"
+HEADER = struct.Struct("<II")
+BUCKET = struct.Struct("<BBII")
+OFFSET = struct.Struct("<I")
+
+LENGTH_LIMITS = (5, 8, 12)  # Classes : 1-5, 6-8, 9-12, 13+ lettres
+ACCENTS = set("àâäéèêëîïôöùûüÿçœæ")
+RARE_LETTERS = set("jkqwxyz-")
+LEVELS = len(LENGTH_LIMITS) + 1 + 2  # Niveau = classe de longueur + difficulté (0 à 2)
+
+
+def classe_longueur(mot):
+    for classe, limite in enumerate(LENGTH_LIMITS):
+        if len(mot) <= limite:
+            return classe
+    return len(LENGTH_LIMITS)
+
+
+def difficulte(mot):
+    # Un point pour les accents, un pour les lettres rares ou le tiret
+    lettres = set(mot.lower())
+    return bool(lettres & ACCENTS) + bool(lettres & RARE_LETTERS)
+
+
+def niveau_pour_delai(delai, delai_initial, delai_min=1):
+    # Niveau maximal du mot : au temps initial, tout le corpus ; plus le temps
+    # accordé est court, plus les mots longs et difficiles sont écartés
+    if delai_initial <= delai_min:
+        return LEVELS - 1
+    ratio = (delai - delai_min) / (delai_initial - delai_min)
+    return round(max(0, min(1, ratio)) * (LEVELS - 1))
+
+
+def lire_source(path=CORPUS_SOURCE):
+    mots = {}
+    with open(path, encoding="utf-8") as file:
+        for ligne in file:
+            mot = ligne.strip()
+            # Seuls les caractères saisissables pendant le défi sont gardés
+            if mot and not mot.startswith("#") and all(c.isalpha() or c in " -" for c in mot):
+                mots[mot] = None
+    return list(mots)
+
+
+def construire(source=CORPUS_SOURCE):
+    # Contenu complet du fichier compilé, en octets
+    seaux = {}
+    for mot in lire_source(source):
+        seaux.setdefault((classe_longueur(mot), difficulte(mot)), []).append(mot.encode("utf-8"))
+
+    table = []
+    decalages = [0]
+    blob = []
+    premier = 0
+    for (classe, diff), mots in sorted(seaux.items()):
+        table.append(BUCKET.pack(classe, diff, premier, len(mots)))
+        for mot in mots:
+            blob.append(mot)
+            decalages.append(decalages[-1] + len(mot))
+        premier += len(mots)
+
+    return b"".join([
+        CORPUS_MAGIC,
+        HEADER.pack(len(table), premier),
+        *table,
+        b"".join(OFFSET.pack(d) for d in decalages),
+        *blob,
+    ])
+
+
+def compiler(source=CORPUS_SOURCE, path=CORPUS_FILE):
+    data = construire(source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+class WordCorpus:
+    def __init__(self, path=CORPUS_FILE, source=CORPUS_SOURCE, cache_path=CORPUS_CACHE):
+        self.path = path
+        self.source = source
+        self.cache_path = cache_path
+        self.data = None
+        self.seaux = {}  # (classe, difficulté) -> (premier mot, nombre)
+        self.niveaux = {}  # niveau -> seaux non vides de ce niveau
+
+    def _ouvrir(self):
+        if self.data is not None:
+            return
+        # Fichier compilé à côté du module, sinon dans le cache utilisateur ;
+        # installation en lecture seule sans cache : index construit en mémoire
+        data = None
+        for path in (self.path, self.cache_path):
+            try:
+                data = self._mapper(path)
+                break
+            except (OSError, ValueError) as e:
+                print(f"Corpus {path} indisponible: {e}")
+        if data is None:
+            data = construire(self.source)
+        position = len(CORPUS_MAGIC)
+        nb_seaux, self.nb_mots = HEADER.unpack_from(data, position)
+        position += HEADER.size
+        for _ in range(nb_seaux):
+            classe, diff, premier, nombre = BUCKET.unpack_from(data, position)
+            self.seaux[(classe, diff)] = (premier, nombre)
+            if nombre:
+                self.niveaux.setdefault(classe + diff, []).append((premier, nombre))
+            position += BUCKET.size
+        self.decalages_pos = position
+        self.mots_pos = position + OFFSET.size * (self.nb_mots + 1)
+        self.data = data
+
+    def _mapper(self, path):
+        perime = not os.path.exists(path) or (
+            os.path.exists(self.source) and os.path.getmtime(self.source) > os.path.getmtime(path))
+        if perime:
+            compiler(self.source, path)
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(CORPUS_MAGIC)] != CORPUS_MAGIC:
+            data.close()
+            raise ValueError("format inconnu")
+        return data
+
+    def __len__(self):
+        self._ouvrir()
+        return self.nb_mots
+
+    def mot(self, index):
+        self._ouvrir()
+        debut, fin = struct.unpack_from("<II", self.data, self.decalages_pos + OFFSET.size * index)
+        return self.data[self.mots_pos + debut:self.mots_pos + fin].decode("utf-8")
+
+    def tailles(self):
+        self._ouvrir()
+        return {seau: nombre for seau, (_, nombre) in self.seaux.items()}
+
+    def choisir_dans(self, classe, diff):
+        self._ouvrir()
+        premier, nombre = self.seaux.get((classe, diff), (0, 0))
+        if not nombre:
+            return None
+        return self.mot(premier + random.randrange(nombre))
+
+    def choisir(self, niveau=None):
+        # Mot au hasard, uniforme parmi tous les seaux de niveau inférieur ou
+        # égal à `niveau` (jamais un seul seau presque vide) ; à défaut, le
+        # niveau non vide le plus bas
+        self._ouvrir()
+        if niveau is None:
+            niveau = LEVELS - 1
+        candidats = [seau for n, seaux in self.niveaux.items() if n <= niveau for seau in seaux]
+        if not candidats and self.niveaux:
+            candidats = self.niveaux[min(self.niveaux)]
+        total = sum(nombre for _, nombre in candidats)
+        if not total:
+            return None
+        tirage = random.randrange(total)
+        for premier, nombre in candidats:
+            if tirage < nombre:
+                return self.mot(premier + tirage)
+            tirage -= nombre
+
+    def fermer(self):
+        if self.data is not None:
+            if isinstance(self.data, mmap.mmap):
+                self.data.close()
+            self.data = None
+            self.seaux = {}
+            self.niveaux = {}
@@ -1,11 +1,12 @@
 import random
-import json
-import os
 from datetime import datetime
-import requests
+from api_mots import client_partage
+from corpus import WordCorpus
+from score_store import SCORES_FILE, Leaderboard, appliquer_partie, nouvelle_partie, ouvrir_store
 
-SCORES_FILE = "scores.json"
-API_URL = "https://random-word-api.herokuapp.com/word?number=1&lang=fr"
+ANCIEN_SCORES_FILE = "scores.json"  # Avant le fichier partagé web/scores.json
+SCORE_STORE = ouvrir_store(SCORES_FILE)
+CORPUS = WordCorpus()  # Mots de secours hors ligne
 
 def init_barillet(nb_balles=1):
     barillet = [0] * (6 - nb_balles) + [1] * nb_balles
@@ -22,19 +23,12 @@ def tirer(barillet, joueur):
         return False  # La partie continue
 
 def get_random_word():
-    try:
-        response = requests.get(API_URL)
-        if response.status_code == 200:
-            return response.json()[0]
-        else:
-            print(f"Erreur lors de la récupération du mot : {response.status_code}")
-            return None
-    except Exception as e:
-        print(f"Exception lors de la récupération du mot : {e}")
-        return None
+    # Client partagé : connexions réutilisées, mots reçus par lots, et plus
+    # aucun appel tant que l'API est coupée (None immédiat)
+    return client_partage().mot()
 
 def defis_mot(joueur):
-    mot = get_random_word() or random.choice(["bonjour", "merci", "voiture", "maison", "chat", "chien", "livre"])
+    mot = get_random_word() or CORPUS.choisir()
     print(f"Défi de mot pour le joueur {joueur} : Tapez '{mot}' pour survivre.")
     saisie = input("Votre saisie : ")
     return saisie.lower() == mot.lower()
@@ -53,25 +47,22 @@ def jouer(nb_balles):
     return None  # Aucun joueur éliminé
 
 def charger_scores():
-    if os.path.exists(SCORES_FILE):
-        with open(SCORES_FILE, "r") as file:
-            return json.load(file)
-    return {"parties": [], "scores": {}}
+    return SCORE_STORE.charger()
 
-def sauvegarder_scores(data):
-    with open(SCORES_FILE, "w") as file:
-        json.dump(data, file, indent=4)
+def enregistrer_partie(data, partie, leaderboard=None):
+    appliquer_partie(data, partie, leaderboard)
+    SCORE_STORE.enregistrer_partie(partie)
 
-def afficher_classement(scores):
-    classement = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+def afficher_classement(classement):
     print("\nClassement général :")
     for joueur, score in classement:
         print(f"Joueur {joueur}: {score} points")
 
 def main():
     print("Bienvenue au jeu de la Roulette Russe !")
+    SCORE_STORE.importer(ANCIEN_SCORES_FILE)
     data = charger_scores()
-    scores = data["scores"]
+    leaderboard = Leaderboard(data["scores"])
     scores_partie = {1: 0, 2: 0}
     while True:
         nb_balles = int(input("Entrez le nombre de balles dans le barillet (1-5): "))
@@ -86,18 +77,9 @@ def main():
         if rejouer != 'o':
             print("Merci d'avoir joué !")
             print(f"Scores finaux de la partie: Joueur 1 - {scores_partie[1]}, Joueur 2 - {scores_partie[2]}")
-            for joueur, score in scores_partie.items():
-                if str(joueur) in scores:
-                    scores[str(joueur)] += score
-                else:
-                    scores[str(joueur)] = score
-            data["parties"].append({
-                "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "scores": scores_partie.copy()
-            })
-            data["scores"] = scores
-            sauvegarder_scores(data)
-            afficher_classement(scores)
+            partie = nouvelle_partie(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), scores_partie)
+            enregistrer_partie(data, partie, leaderboard)
+            afficher_classement(leaderboard.top())
             break
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+import queue
+import threading
+
+from api_mots import client_partage
+
+# Mots du défi : un thread de fond garde une file bornée de mots prêts,
+# remplie par lots auprès de l'API (paramètre number=N) via le client partagé
+# d'api_mots. Prendre un mot ne touche jamais le réseau : si la file est vide,
+# on pioche aussitôt dans le corpus local, au niveau de difficulté demandé.
+
+
+class WordProvider:
+    def __init__(self, corpus, client=None, capacity=20, batch=10, retry_delay=5.0):
+        self.corpus = corpus  # Objet avec choisir(niveau), voir corpus.WordCorpus
+        self.client = client or client_partage()
+        self.batch = batch
+        self.retry_delay = retry_delay  # Pause après un échec avant de réessayer
+        self.words = queue.Queue(maxsize=capacity)
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.stats = {"api": 0, "fallback": 0}
+
+        self.thread = None
+        if self.client.url:
+            self.thread = threading.Thread(target=self._run, name="word-provider", daemon=True)
+            self.thread.start()
+            self.wake.set()
+
+    def prendre(self, niveau=None):
+        # Non bloquant : mot de la file, sinon mot local du niveau demandé
+        try:
+            word = self.words.get_nowait()
+            self.stats["api"] += 1
+        except queue.Empty:
+            word = self.corpus.choisir(niveau)
+            self.stats["fallback"] += 1
+        self.wake.set()
+        return word
+
+    def _run(self):
+        while not self.stopping.is_set():
+            self.wake.wait()
+            self.wake.clear()
+            while not self.stopping.is_set():
+                space = self.words.maxsize - self.words.qsize()
+                if space < self.batch:
+                    break
+                words = self.client.mots(self.batch)
+                if not words:
+                    # Échec ou disjoncteur ouvert : attendre avant de réessayer
+                    self.stopping.wait(max(self.retry_delay, self.client.breaker.attente()))
+                    continue
+                for word in words:
+                    try:
+                        self.words.put_nowait(word)
+                    except queue.Full:
+                        break
+
+    def arreter(self, timeout=2):
+        self.stopping.set()
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout)
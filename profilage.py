@@ -0,0 +1,132 @@
+import csv
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+from rendu import OVERLAYS, render_text
+
+# Profileur d'images, désactivé par défaut : ROULETTE_PROFILE=1 (ou la touche
+# F3) l'active. Chaque phase de la boucle est chronométrée par tours
+# successifs (lap) depuis le début de l'image ; les durées des dernières
+# images alimentent les percentiles affichés en surimpression, et la trace
+# complète est écrite à la sortie dans ROULETTE_PROFILE_TRACE (.json ou .csv).
+
+PROFILE_ENABLED = os.environ.get("ROULETTE_PROFILE", "") not in ("", "0")
+PROFILE_TRACE = os.environ.get("ROULETTE_PROFILE_TRACE", "profil_images.json")
+WHITE = (236, 240, 241)
+
+
+def percentile(sorted_values, p):
+    # Rang le plus proche sur une liste déjà triée
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    def __init__(self, enabled=PROFILE_ENABLED, window=600, trace_limit=100000, hud_refresh=500):
+        self.enabled = enabled
+        self.window = window  # Images prises en compte pour les percentiles
+        self.samples = {}  # phase -> deque des durées (ms) des dernières images
+        self.trace = deque(maxlen=trace_limit)
+        self.frame = None
+        self.frame_start = 0
+        self.last_lap = 0
+        self.frame_count = 0
+        self.hud_refresh = hud_refresh
+        self.hud_time = 0
+        self.hud_lines = ()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frame = None
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame = {}
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def lap(self, phase):
+        # Durée écoulée depuis le tour précédent, cumulée dans `phase`
+        if self.frame is None:
+            return
+        now = time.perf_counter()
+        self.frame[phase] = self.frame.get(phase, 0.0) + (now - self.last_lap) * 1000
+        self.last_lap = now
+
+    def end_frame(self):
+        if self.frame is None:
+            return
+        self.frame["frame"] = (time.perf_counter() - self.frame_start) * 1000
+        for phase, duration in self.frame.items():
+            samples = self.samples.get(phase)
+            if samples is None:
+                samples = self.samples[phase] = deque(maxlen=self.window)
+            samples.append(duration)
+        self.frame_count += 1
+        self.trace.append((self.frame_count, self.frame))
+        self.frame = None
+
+    def summary(self):
+        result = {}
+        for phase, samples in self.samples.items():
+            values = sorted(samples)
+            result[phase] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+            }
+        return result
+
+    def hud_state(self):
+        # Lignes du HUD recalculées au plus toutes les `hud_refresh` ms pour
+        # rester lisibles et ne pas redessiner la zone à chaque image
+        if not self.enabled:
+            return None
+        now = pygame.time.get_ticks()
+        if now - self.hud_time >= self.hud_refresh:
+            self.hud_time = now
+            lines = ["phase          p50   p95   p99 (ms)"]
+            for phase, stats in sorted(self.summary().items()):
+                lines.append(f"{phase:<12} {stats['p50']:5.2f} {stats['p95']:5.2f} {stats['p99']:5.2f}")
+            self.hud_lines = tuple(lines)
+        return self.hud_lines
+
+    def hud_rect(self, screen_rect):
+        if not self.enabled:
+            return None
+        height = 8 + 14 * max(1, len(self.hud_lines))
+        return pygame.Rect(screen_rect.right - 265, 5, 260, height)
+
+    def draw_hud(self, surface):
+        rect = self.hud_rect(surface.get_rect())
+        if rect is None:
+            return
+        surface.blit(OVERLAYS.get(180, rect.size), rect)
+        for i, line in enumerate(self.hud_lines):
+            surface.blit(render_text(line, WHITE, "Consolas", 12), (rect.x + 4, rect.y + 4 + i * 14))
+
+    def dump(self, path=PROFILE_TRACE):
+        if not self.trace:
+            return None
+        phases = sorted({phase for _, frame in self.trace for phase in frame})
+        if path.endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["image"] + phases)
+                for number, frame in self.trace:
+                    writer.writerow([number] + [f"{frame[phase]:.4f}" if phase in frame else "" for phase in phases])
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "resume": self.summary(),
+                    "images": [dict(frame, image=number) for number, frame in self.trace],
+                }, f)
+        return path
@@ -0,0 +1,163 @@
+import math
+import pygame
+from collections import OrderedDict
+
+BLACK = (0, 0, 0)
+
+# Caches de rendu partagés par les composants du jeu : les polices ne sont
+# créées qu'une fois, et les textes déjà rendus sont réutilisés tant que
+# (police, texte, couleur) ne change pas.
+
+
+class FontRegistry:
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        total = self.hits + self.misses
+        ratio = self.hits / total if total else 0
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.surfaces), "hit_ratio": ratio}
+
+
+class OverlayPool:
+    # Voiles noirs semi-transparents réutilisables : une seule surface par
+    # taille, dont l'opacité (alpha de surface) est réglée juste avant chaque
+    # blit. Les fondus ne créent donc aucune surface en cours d'animation.
+    def __init__(self):
+        self.surfaces = {}
+        self.allocations = 0
+        self.requests = 0
+
+    def get(self, alpha, size):
+        self.requests += 1
+        key = tuple(size)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            self.allocations += 1
+            surface = pygame.Surface(size).convert()
+            surface.fill(BLACK)
+            self.surfaces[key] = surface
+        surface.set_alpha(max(0, min(255, int(alpha))))
+        return surface
+
+    def stats(self):
+        return {"requests": self.requests, "allocations": self.allocations, "surfaces": len(self.surfaces)}
+
+
+class SpriteAtlas:
+    # Variantes d'une image calculées une fois au chargement (miroir
+    # horizontal et rotations par pas de `angle_step` degrés) : dessiner un
+    # sprite se résume ensuite à une recherche dans un dict et un blit.
+    def __init__(self, image, angle_step, angles=(0,), flip=False):
+        self.image = image
+        self.angle_step = angle_step
+        self.frames = {}
+        for flipped in ((False, True) if flip else (False,)):
+            for angle in angles:
+                self.frame(angle, flipped)
+
+    def frame(self, angle, flipped):
+        angle = round(angle / self.angle_step) * self.angle_step % 360
+        key = (flipped, angle)
+        frame = self.frames.get(key)
+        if frame is None:
+            # Angle hors du jeu pré-calculé : calculé une fois puis conservé
+            frame = pygame.transform.flip(self.image, True, False) if flipped else self.image
+            if angle:
+                frame = pygame.transform.rotate(frame, angle)
+            self.frames[key] = frame
+        return frame
+
+    def get(self, angle=0, flipped=False):
+        return self.frame(angle, flipped)
+
+
+FONTS = FontRegistry()
+TEXT_CACHE = TextCache()
+OVERLAYS = OverlayPool()
+
+
+def render_text(text, color, name="Arial", size=20, bold=False):
+    return TEXT_CACHE.render(FONTS.get(name, size, bold), text, color)
+
+
+class Retained:
+    # Élément en mode retenu : il compare son état à celui du dernier rendu et
+    # signale les zones d'écran à recomposer (ancienne et nouvelle position).
+    drawn_state = None
+    drawn_bounds = None
+
+    def render_state(self):
+        raise NotImplementedError
+
+    def bounds(self):
+        raise NotImplementedError
+
+    def collect_dirty(self, rects):
+        state = self.render_state()
+        if state == self.drawn_state:
+            return
+        bounds = self.bounds()
+        if self.drawn_bounds is not None:
+            rects.append(self.drawn_bounds)
+        if bounds is not None:
+            rects.append(bounds)
+        self.drawn_state = state
+        self.drawn_bounds = bounds
+
+    def mark_dirty(self):
+        self.drawn_state = None
+
+
+class RetainedArea(Retained):
+    # Zone d'écran sans classe propre (arme, indicateur, défi...) décrite par
+    # deux fonctions : l'état affiché et le rectangle occupé.
+    def __init__(self, state_fn, bounds_fn):
+        self.state_fn = state_fn
+        self.bounds_fn = bounds_fn
+
+    def render_state(self):
+        return self.state_fn()
+
+    def bounds(self):
+        return self.bounds_fn()
+
+
+def rotated_bounds(width, height, angle, center, margin=2):
+    # Rectangle englobant d'une image width x height tournée de `angle` degrés
+    rad = math.radians(angle)
+    cos, sin = abs(math.cos(rad)), abs(math.sin(rad))
+    rect = pygame.Rect(0, 0, int(width * cos + height * sin) + margin * 2, int(width * sin + height * cos) + margin * 2)
+    rect.center = center
+    return rect
@@ -1,20 +1,25 @@
 import pygame
 import sys
 import random
-import json
 import os
-import requests
+from collections import deque
 from datetime import datetime
-
-# Base configuration
-pygame.init()
-pygame.font.init()
-pygame.mixer.init()
-pygame.display.set_caption("Roulette Russe - PyGame Edition")
+from animation import FramePacer, Timeline
+from assets import ASSETS
+from barillet import Barillet
+from corpus import WordCorpus, niveau_pour_delai
+from mots import WordProvider
+from profilage import FrameProfiler
+from rendu import FONTS, OVERLAYS, TEXT_CACHE, Retained, RetainedArea, SpriteAtlas, render_text, rotated_bounds
+from score_store import SCORES_FILE, Leaderboard, PersistenceWorker, appliquer_partie, nouvelle_partie, ouvrir_store
 
 # Constants
 SCREEN_WIDTH, SCREEN_HEIGHT = 900, 700
-SCREEN = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+SCREEN = None  # Fenêtre (ou surface hors écran) créée par init_pygame()
+
+# Mode sans fenêtre ni carte son (bancs d'essai, parties automatiques) :
+# ROULETTE_HEADLESS=1 ou Game(headless=True)
+HEADLESS = os.environ.get("ROULETTE_HEADLESS", "") not in ("", "0")
 
 # Colors
 DARK_BLUE = (44, 62, 80)
@@ -28,9 +33,18 @@ GRAY = (149, 165, 166)
 RED = (231, 76, 60)
 BLACK = (0, 0, 0)
 
+LOG_HISTORY = int(os.environ.get("ROULETTE_LOG_HISTORY", 5000))  # Lignes gardées dans le journal
+
+
+# Score file (web/scores.json, partagé avec main.py et server.py), ouvert à
+# la première partie seulement : Game(store=...) permet d'en utiliser un autre
+_score_writer = None
 
-# Score file
-SCORES_FILE = "web/scores.json"
+def score_writer():
+    global _score_writer
+    if _score_writer is None:
+        _score_writer = PersistenceWorker(ouvrir_store(SCORES_FILE))  # Écritures hors du thread pygame
+    return _score_writer
 
 # Sound effects paths
 SOUNDS = {
@@ -42,6 +56,23 @@ SOUNDS = {
     "win": "win.wav"
 }
 
+# Base configuration, faite à la création du jeu et non plus à l'import
+def init_pygame(headless=HEADLESS, surface=None):
+    global SCREEN
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
+        os.environ["SDL_AUDIODRIVER"] = "dummy"
+    pygame.init()
+    pygame.font.init()
+    pygame.mixer.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_caption("Roulette Russe - PyGame Edition")
+        pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Une surface hors écran peut remplacer la fenêtre ; le mode vidéo reste
+    # nécessaire pour convert()
+    SCREEN = surface if surface is not None else pygame.display.get_surface()
+    return SCREEN
+
 # Load sound effects
 def load_sounds():
     loaded_sounds = {}
@@ -53,34 +84,17 @@ def load_sounds():
                 print(f"Could not load sound: {path}")
     return loaded_sounds
 
-def init_barillet(nb_balles=1):
-    barillet = [0] * (6 - nb_balles) + [1] * nb_balles
-    random.shuffle(barillet)
-    return barillet
-
 def tirer(barillet):
-    if barillet.pop(0) == 1:
-        return True  # Game over
-    else:
-        return False  # Game continues
+    return barillet.tirer()  # True : chambre chargée
 
-def charger_scores():
-    if os.path.exists(SCORES_FILE):
-        try:
-            with open(SCORES_FILE, "r") as file:
-                return json.load(file)
-        except json.JSONDecodeError:
-            print(f"Error reading {SCORES_FILE}. Creating new score file.")
-    return {"parties": [], "scores": {}}
+def charger_scores(writer=None):
+    return (writer or score_writer()).store.charger()
 
-def sauvegarder_scores(data):
-    try:
-        with open(SCORES_FILE, "w") as file:
-            json.dump(data, file, indent=4)
-    except Exception as e:
-        print(f"Error saving scores: {e}")
+def enregistrer_partie(data, partie, leaderboard=None, writer=None):
+    appliquer_partie(data, partie, leaderboard)
+    (writer or score_writer()).enregistrer_partie(partie)
 
-class Button:
+class Button(Retained):
     def __init__(self, x, y, width, height, color, text, text_color=WHITE, font_size=20):
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
@@ -88,11 +102,17 @@ class Button:
         self.hover_color = self.get_hover_color(color)
         self.text = text
         self.text_color = text_color
-        self.font = pygame.font.SysFont("Arial", font_size, bold=True)
+        self.font = FONTS.get("Arial", font_size, bold=True)
         self.active = True
         self.is_hovering = False
         self.transition_progress = 0
         
+    def render_state(self):
+        return (self.text, self.active, self.is_hovering, self.transition_progress, tuple(self.rect))
+
+    def bounds(self):
+        return self.rect.union(self.rect.move(2, 2))  # Avec l'ombre portée
+
     def get_hover_color(self, color):
         r, g, b = color
         return (min(r+20, 255), min(g+20, 255), min(b+20, 255))
@@ -122,13 +142,16 @@ class Button:
         
         pygame.draw.rect(surface, (0, 0, 0, 64), self.rect, 1, border_radius=8)
         
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = TEXT_CACHE.render(self.font, self.text, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         
         surface.blit(text_surface, text_rect)
         
     def is_hovered(self, pos):
         return self.rect.collidepoint(pos) and self.active
+
+    def in_transition(self):
+        return self.transition_progress < 1 if self.is_hovering else self.transition_progress > 0
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -140,17 +163,28 @@ class Button:
             self.is_hovering = False
             self.transition_progress = 0
 
-class TextBox:
-    def __init__(self, x, y, width, height, font_size=20, max_chars=20):
+class TextBox(Retained):
+    def __init__(self, x, y, width, height, font_size=20, max_chars=20, clock=pygame.time.get_ticks):
         self.rect = pygame.Rect(x, y, width, height)
+        self.clock = clock  # Temps en ms (horloge du jeu)
         self.color = WHITE
         self.text = ""
-        self.font = pygame.font.SysFont("Arial", font_size)
+        self.font = FONTS.get("Arial", font_size)
         self.active = False
         self.max_chars = max_chars
-        self.blink_timer = 0
-        self.cursor_visible = True
+        self.blink_start = 0
         
+    def cursor_visible(self):
+        # Clignotement calé sur l'horloge : il reste régulier quelle que soit
+        # la cadence d'affichage
+        return (self.clock() - self.blink_start) // 500 % 2 == 0
+
+    def render_state(self):
+        return (self.text, self.active, self.active and self.cursor_visible())
+
+    def bounds(self):
+        return self.rect
+
     def draw(self, surface):
         pygame.draw.rect(surface, self.color, self.rect, border_radius=5)
         
@@ -158,18 +192,13 @@ class TextBox:
         border_width = 2 if self.active else 1
         pygame.draw.rect(surface, border_color, self.rect, border_width, border_radius=5)
         
-        text_surface = self.font.render(self.text, True, DARK_BLUE)
+        text_surface = TEXT_CACHE.render(self.font, self.text, DARK_BLUE)
         text_rect = text_surface.get_rect(center=self.rect.center)
         
         surface.blit(text_surface, text_rect)
         
         if self.active:
-            self.blink_timer += 1
-            if self.blink_timer >= 30:
-                self.cursor_visible = not self.cursor_visible
-                self.blink_timer = 0
-                
-            if self.cursor_visible:
+            if self.cursor_visible():
                 cursor_x = text_rect.right + 2
                 if cursor_x > self.rect.right - 5:
                     cursor_x = self.rect.right - 5
@@ -185,8 +214,7 @@ class TextBox:
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.rect.collidepoint(event.pos):
                 self.active = True
-                self.cursor_visible = True
-                self.blink_timer = 0
+                self.blink_start = self.clock()
             else:
                 self.active = False
                 
@@ -198,46 +226,69 @@ class TextBox:
             elif len(self.text) < self.max_chars:
                 self.text += event.unicode
 
-class EventLog:
-    def __init__(self, x, y, width, height):
+class EventLog(Retained):
+    # Journal en anneau : l'historique complet (jusqu'à `history` lignes) est
+    # gardé dans un deque, mais seules les lignes visibles sont dessinées.
+    # Chaque ligne est rendue une fois à l'insertion ; seules les
+    # `cached_lines` plus récentes gardent leur surface. Les plus anciennes
+    # sont re-rendues à chaque dessin si on remonte jusqu'à elles, sans être
+    # gardées : la mémoire reste bornée quel que soit le défilement.
+    def __init__(self, x, y, width, height, history=LOG_HISTORY, cached_lines=200):
         self.rect = pygame.Rect(x, y, width, height)
         self.color = DARK_BLUE
         self.border_color = LIGHT_BLUE
-        self.font = pygame.font.SysFont("Consolas", 14)
-        self.messages = []
-        self.max_messages = 12
-        self.scroll_offset = 0
+        self.font = FONTS.get("Consolas", 14)
+        self.entries = deque(maxlen=history)  # [texte, couleur, surface], du plus ancien au plus récent
+        self.cached_lines = cached_lines
+        self.visible_lines = 12
+        self.scroll_offset = 0  # Nombre de lignes remontées dans l'historique
         self.scroll_bar_width = 15
         self.scroll_bar_rect = pygame.Rect(x + width - self.scroll_bar_width, y, self.scroll_bar_width, height)
         self.dragging_scrollbar = False
         self.line_height = 22
+        self.version = 0  # Incrémentée à chaque changement du contenu affiché
         
+    def render_state(self):
+        # Une rafale de messages ne provoque qu'un seul rendu à l'image suivante
+        return (self.version, self.scroll_offset)
+
+    def bounds(self):
+        return self.rect
+
+    def render_line(self, entry):
+        if entry[2] is None:
+            return self.font.render(entry[0], True, entry[1])
+        return entry[2]
+
+    def max_scroll(self):
+        return max(0, len(self.entries) - self.visible_lines)
+
     def add_message(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        scroll_was_at_bottom = self.scroll_offset == 0
-        self.messages.insert(0, f"[{timestamp}] {message}")
+        text = f"[{timestamp}] {message}"
+        text_color = ORANGE if "⭐" in text else RED if "BOUM" in text else WHITE
+        entry = [text, text_color, self.font.render(text, True, text_color)]
+        self.entries.append(entry)
+        self.version += 1
         
-        if len(self.messages) > self.max_messages:
-            self.messages.pop()
+        # Libérer la surface de la ligne qui sort de la fenêtre de cache
+        if len(self.entries) > self.cached_lines:
+            self.entries[-self.cached_lines - 1][2] = None
         
-        if scroll_was_at_bottom:
+        if self.scroll_offset == 0:
             self.scroll_to_bottom()
-        
-        if pygame.display.get_surface():
-            self.draw(pygame.display.get_surface())
-            pygame.display.flip()
+        else:
+            # Historique consulté : garder les mêmes lignes à l'écran
+            self.scroll_offset = min(self.max_scroll(), self.scroll_offset + 1)
     
     def scroll_to_bottom(self):
         self.scroll_offset = 0
-        if pygame.display.get_surface():
-            self.draw(pygame.display.get_surface())
-            pygame.display.flip()
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.rect.collidepoint(event.pos):
                 if event.button == 4:
-                    self.scroll_offset = min(len(self.messages) - self.max_messages, self.scroll_offset + 1) if len(self.messages) > self.max_messages else 0
+                    self.scroll_offset = min(self.max_scroll(), self.scroll_offset + 1)
                 elif event.button == 5:
                     self.scroll_offset = max(0, self.scroll_offset - 1)
                     
@@ -245,8 +296,7 @@ class EventLog:
         pygame.draw.rect(surface, self.color, self.rect, border_radius=10)
         pygame.draw.rect(surface, self.border_color, self.rect, 2, border_radius=10)
         
-        total_messages = len(self.messages)
-        visible_messages = self.messages[max(0, total_messages - self.max_messages - self.scroll_offset):total_messages - self.scroll_offset]
+        total_messages = len(self.entries)
         
         clip_rect = pygame.Rect(
             self.rect.x + 5, 
@@ -254,9 +304,14 @@ class EventLog:
             self.rect.width - self.scroll_bar_width - 10, 
             self.rect.height - 10
         )
-        surface.set_clip(clip_rect)
-        
-        for i, message in enumerate(visible_messages):
+        previous_clip = surface.get_clip()
+        surface.set_clip(clip_rect.clip(previous_clip))
+        
+        # Fenêtre visible : les plus récents en haut, décalés de scroll_offset
+        for i in range(self.visible_lines):
+            index = total_messages - 1 - self.scroll_offset - i
+            if index < 0:
+                break
             y_pos = self.rect.y + 10 + i * self.line_height
             
             if y_pos < self.rect.bottom - 10:
@@ -269,17 +324,15 @@ class EventLog:
                     )
                     pygame.draw.rect(surface, (60, 80, 100, 128), row_bg, border_radius=3)
                 
-                text_color = ORANGE if "⭐" in message else RED if "BOUM" in message else WHITE
-                text_surface = self.font.render(message, True, text_color)
-                surface.blit(text_surface, (self.rect.x + 10, y_pos))
+                surface.blit(self.render_line(self.entries[index]), (self.rect.x + 10, y_pos))
         
-        surface.set_clip(None)
+        surface.set_clip(previous_clip)
         
-        if total_messages > self.max_messages:
-            visible_ratio = min(1, self.max_messages / total_messages)
+        if total_messages > self.visible_lines:
+            visible_ratio = min(1, self.visible_lines / total_messages)
             scroll_height = max(30, visible_ratio * self.rect.height)
             
-            max_scroll = total_messages - self.max_messages
+            max_scroll = self.max_scroll()
             if max_scroll > 0:
                 scroll_ratio = 1 - (self.scroll_offset / max_scroll)
                 scroll_pos = scroll_ratio * (self.rect.height - scroll_height)
@@ -295,7 +348,7 @@ class EventLog:
             pygame.draw.rect(surface, LIGHT_BLUE, scroll_bar, border_radius=5)
             pygame.draw.rect(surface, WHITE, scroll_bar, 1, border_radius=5)
 
-class Player:
+class Player(Retained):
     def __init__(self, x, y, image_path=None, color=None):
         self.x = x
         self.y = y
@@ -305,19 +358,28 @@ class Player:
         self.height = 120
         self.angle = 0
         
-        if image_path and os.path.exists(image_path):
-            self.original_image = pygame.image.load(image_path)
-            self.original_image = pygame.transform.scale(self.original_image, (self.width, self.height))
+        # Image mise à l'échelle et convertie par le gestionnaire d'images
+        self.original_image = ASSETS.image(image_path, (self.width, self.height)) if image_path else None
+        if self.original_image:
             self.image = self.original_image.copy()
+            # Chute : rotation de 12° par image
+            self.atlas = SpriteAtlas(self.original_image, 12, range(0, 360, 12))
         else:
             self.original_image = None
             self.image = None
+            self.atlas = None
             self.color = color or BLUE
     
+    def render_state(self):
+        return (self.x, self.y, self.angle)
+
+    def bounds(self):
+        return rotated_bounds(self.width, self.height, self.angle, (self.x, self.y))
+
     def draw(self, surface):
         if self.image:
             if self.angle != 0:
-                rotated_image = pygame.transform.rotate(self.original_image, self.angle)
+                rotated_image = self.atlas.get(self.angle)
                 rotated_rect = rotated_image.get_rect(center=(self.x, self.y))
                 surface.blit(rotated_image, rotated_rect.topleft)
             else:
@@ -335,9 +397,17 @@ class Player:
         self.angle = 0
 
 class Game:
-    def __init__(self):
-        self.data = charger_scores()
+    def __init__(self, headless=HEADLESS, surface=None, store=None):
+        init_pygame(headless, surface)
+        self.headless = headless
+        self.offscreen = surface is not None  # Rendu sans présentation à l'écran
+        # Horloge du jeu en ms, avancée par step(dt) : chrono du défi,
+        # clignotements et pulsations en dépendent, pas l'horloge murale
+        self.time = 0
+        self.score_writer = PersistenceWorker(store) if store is not None else score_writer()
+        self.data = charger_scores(self.score_writer)
         self.scores = self.data["scores"]
+        self.leaderboard = Leaderboard(self.scores)
         self.player1_nickname = ""
         self.player2_nickname = ""
         self.scores_partie = {}
@@ -349,13 +419,15 @@ class Game:
         self.game_over = False
         self.entering_nicknames = False
         
-        self.gun_image = pygame.image.load("gun.png")
-        self.gun_image = pygame.transform.scale(self.gun_image, (100, 50))
+        self.gun_image = ASSETS.image("gun.png", (100, 50))
         
         # Initialiser l'image du pistolet en mode miroir si le joueur actif est le joueur 2
         if self.joueur == 2:
             self.gun_image = pygame.transform.flip(self.gun_image, True, False)
         
+        # Recul : de -15° à 0° par pas de 3°, pour les deux orientations
+        self.gun_atlas = SpriteAtlas(self.gun_image, 3, range(-15, 1, 3), flip=True)
+        
         self.word_challenge_active = False
         self.challenge_word = ""
         self.challenge_input = ""
@@ -363,27 +435,20 @@ class Game:
         self.initial_challenge_time_limit = 5  # Temps initial de base
         self.challenge_time_limit = self.initial_challenge_time_limit  # Temps actuel qui va diminuer
         
-        self.api_url = "https://random-word-api.herokuapp.com/word?number=1&lang=fr"
-        
-        self.french_words = [
-            "bonjour", "merci", "voiture", "maison", "chat", "chien", "livre",
-            "bibliothèque", "restaurant", "université", "appartement", "ordinateur",
-            "développement", "anticonstitutionnellement", "parallélépipède", "chrysanthème",
-            "psychologique", "extraordinaire", "métaphysique", "philosophique",
-            "encyclopédie", "rhinocéros", "hippopotame", "xylophone", "zoologique",
-            "archéologie", "astronomie", "chlorophylle", "démocratie", "économique",
-            "géographie", "hémisphère", "intelligence", "journalisme", "kilogramme",
-            "laboratoire", "magnétique", "neurologie", "orthographe", "pneumonie",
-            "quintessence", "révolution", "synchroniser", "technologie", "ultraviolet"
-        ]
+        # Mots préchargés en arrière-plan, corpus local si la file est vide
+        self.corpus = WordCorpus()
+        self.words = WordProvider(self.corpus)
 
 
         self.sounds = load_sounds()
-        self.music_enabled = True
+        self.music_enabled = not headless  # Ni musique ni sons sans carte son
         self.music_volume = 0.5
         self.music_initialized = False
-        self.initialize_music()
+        if self.music_enabled:
+            self.initialize_music()
 
+        # Animations en cours, avancées par la boucle principale
+        self.timeline = Timeline()
         self.animations = {
             "gun_recoil": False,
             "gun_angle": 0,
@@ -421,6 +486,25 @@ class Game:
         self.gun_rect = pygame.Rect(arena_center_x-25, arena_center_y-60, 50, 50)
         self.gun_original_pos = (arena_center_x, arena_center_y-60)
         self.gun_pos = list(self.gun_original_pos)
+
+        # Rendu par zones : seules les zones dont l'état a changé sont
+        # recomposées puis envoyées à l'écran
+        self.scene_state = None
+        self.full_redraw = True
+        self.frame_rects = []  # Zones recomposées à présenter en fin d'image
+        self.backgrounds = {}  # Fonds statiques par disposition
+        self.challenge_box = pygame.Rect(280, 150, 570, 200)
+        self.profiler = FrameProfiler()  # ROULETTE_PROFILE=1 ou touche F3
+        self.retained = [
+            self.start_button, self.tirer_button, self.rejouer_button, self.music_button,
+            self.continue_button, self.nb_balles_textbox,
+            self.player1_nickname_input, self.player2_nickname_input,
+            self.event_log, self.player1, self.player2,
+            RetainedArea(self.gun_render_state, self.gun_bounds),
+            RetainedArea(self.indicator_render_state, self.indicator_bounds),
+            RetainedArea(self.challenge_render_state, lambda: self.challenge_box),
+            RetainedArea(self.profiler.hud_state, lambda: self.profiler.hud_rect(SCREEN.get_rect()))
+        ]
     
     def initialize_music(self):
         music_file = self.music_files[self.current_music_index]
@@ -494,15 +578,15 @@ class Game:
         self.tirer_button.set_active(False)
         self.rejouer_button.set_active(False)
         
-        self.nb_balles_textbox = TextBox(130, 150, 50, 30, max_chars=3)
+        self.nb_balles_textbox = TextBox(130, 150, 50, 30, max_chars=3, clock=self.game_time)
         self.nb_balles_textbox.text = "999"  # Définir la valeur par défaut à 999
         
         self.event_log = EventLog(250, 400, 600, 350)
         self.event_log.add_message("Bienvenue dans le jeu de la Roulette Russe !")
         self.event_log.add_message("Entrez le nombre de balles et cliquez sur COMMENCER.")
     
-        self.player1_nickname_input = TextBox(350, 200, 200, 40, font_size=20, max_chars=15)
-        self.player2_nickname_input = TextBox(350, 270, 200, 40, font_size=20, max_chars=15)
+        self.player1_nickname_input = TextBox(350, 200, 200, 40, font_size=20, max_chars=15, clock=self.game_time)
+        self.player2_nickname_input = TextBox(350, 270, 200, 40, font_size=20, max_chars=15, clock=self.game_time)
     
         self.continue_button = Button(0, 0, 200, 40, GREEN, "CONTINUER")
     
@@ -528,17 +612,8 @@ class Game:
         
         self.play_sound("reload")
         
-        if nb_balles <= 6:
-            self.barillet = init_barillet(nb_balles)
-        else:
-            self.barillet = []
-            while nb_balles > 0:
-                if nb_balles >= 6:
-                    self.barillet.extend(init_barillet(6))
-                    nb_balles -= 6
-                else:
-                    self.barillet.extend(init_barillet(nb_balles))
-                    nb_balles = 0
+        # Compteurs seulement : blocs de 6 au-delà de 6 balles, comme avant
+        self.barillet = Barillet(nb_balles)
         
         self.joueur = 1
         self.game_started = True
@@ -555,7 +630,7 @@ class Game:
         self.player1.reset_position()
         self.player2.reset_position()
     
-    def animate_gun_recoil(self):
+    def animate_gun_recoil(self, on_complete=None):
         self.animations["gun_recoil"] = True
         self.animations["gun_angle"] = -15
         
@@ -564,52 +639,58 @@ class Game:
         recoil_frames = 6
         recoil_amount = 15
         
-        for i in range(recoil_frames):
-            if i < recoil_frames // 2:
-                self.gun_pos[0] -= recoil_amount / (recoil_frames // 2)
-            else:
-                self.gun_pos[0] += recoil_amount / (recoil_frames // 2)
-            
+        def step(progress):
+            # Recul puis retour de l'arme, qui se redresse de 3° par image
+            frame = min(recoil_frames - 1, int(progress * recoil_frames))
+            self.gun_pos[0] = self.gun_original_pos[0] - recoil_amount * (1 - abs(2 * progress - 1))
             self.gun_rect.x = self.gun_pos[0] - 25
             self.gun_rect.y = self.gun_pos[1] - 25
-            
-            if self.animations["gun_angle"] < 0:
-                self.animations["gun_angle"] += 3
-            
-            self.draw()
-            pygame.time.delay(20)
+            self.animations["gun_angle"] = min(0, -12 + 3 * frame)
         
-        self.animations["gun_recoil"] = False
-        self.animations["gun_angle"] = 0
-        self.gun_pos = list(self.gun_original_pos)
-        self.gun_rect.x = self.gun_pos[0] - 25
-        self.gun_rect.y = self.gun_pos[1] - 25
+        def done():
+            self.animations["gun_recoil"] = False
+            self.animations["gun_angle"] = 0
+            self.gun_pos = list(self.gun_original_pos)
+            self.gun_rect.x = self.gun_pos[0] - 25
+            self.gun_rect.y = self.gun_pos[1] - 25
+            if on_complete:
+                on_complete()
+        
+        self.timeline.add(recoil_frames * 20, step, done)
     
-    def animate_screen_shake(self):
+    def animate_screen_shake(self, on_complete=None):
         self.animations["shake_amount"] = 10
         
-        for i in range(10):
-            self.animations["shake_amount"] = max(0, self.animations["shake_amount"] - 1)
-            self.draw()
-            pygame.time.delay(30)
+        def step(progress):
+            self.animations["shake_amount"] = round(9 * (1 - progress))
         
-        self.animations["shake_amount"] = 0
+        def done():
+            self.animations["shake_amount"] = 0
+            if on_complete:
+                on_complete()
+        
+        self.timeline.add(300, step, done)
     
     def shoot(self):
+        if self.timeline.busy():
+            return  # Un tir est déjà en cours d'animation
+        
         self.play_sound("click")
         
         current_player = self.player1 if self.joueur == 1 else self.player2
         move_direction = 5 if self.joueur == 1 else -5
+        start_x = current_player.x
+        
+        def forward(progress):
+            current_player.x = start_x + round(10 * move_direction * progress)
         
-        for _ in range(10):
-            current_player.x += move_direction
-            self.draw()
-            pygame.time.delay(20)
-        for _ in range(10):
-            current_player.x -= move_direction
-            self.draw()
-            pygame.time.delay(20)
+        def back(progress):
+            current_player.x = start_x + round(10 * move_direction * (1 - progress))
         
+        # Le résultat du tir n'est connu qu'une fois le joueur revenu en place
+        self.timeline.sequence([(200, forward), (200, back)], self.resolve_shot)
+    
+    def resolve_shot(self):
         is_loaded_chamber = tirer(self.barillet)
         
         if is_loaded_chamber:
@@ -631,9 +712,9 @@ class Game:
                 
     def eliminate_current_player(self):
         self.play_sound("gunshot")
-        self.animate_gun_recoil()
-        self.animate_screen_shake()
-        
+        self.animate_gun_recoil(lambda: self.animate_screen_shake(self.score_elimination))
+    
+    def score_elimination(self):
         current_nickname = self.player1_nickname if self.joueur == 1 else self.player2_nickname
         other_nickname = self.player2_nickname if self.joueur == 1 else self.player1_nickname
         
@@ -642,54 +723,41 @@ class Game:
         self.event_log.add_message(f"{other_nickname} gagne 1 point.")
         
         player = self.player1 if self.joueur == 1 else self.player2
+        start_y = player.y
+        start_fade = self.animations["fade_alpha"]
+        fall_frames = 30
         
-        for i in range(30):
-            player.y += 8
-            player.angle += 12
-            self.animations["fade_alpha"] = min(180, self.animations["fade_alpha"] + 6)
-            self.draw()
-            pygame.time.delay(20)
-            
+        def fall(progress):
+            frame = round(progress * fall_frames)
+            player.y = start_y + 8 * frame
+            player.angle = 12 * frame
+            self.animations["fade_alpha"] = min(180, start_fade + 6 * frame)
+        
+        self.timeline.add(fall_frames * 20, fall, self.finish_elimination)
+    
+    def finish_elimination(self):
         self.play_sound("win")
             
         self.game_over = True
         self.tirer_button.set_active(False)
         self.rejouer_button.set_active(True)
         
-        for nickname, score in self.scores_partie.items():
-            if nickname in self.scores:
-                self.scores[nickname] += score
-            else:
-                self.scores[nickname] = score
-        
-        self.data["parties"].append({
-            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "scores": self.scores_partie.copy()
-        })
-        self.data["scores"] = self.scores
-        sauvegarder_scores(self.data)
+        partie = nouvelle_partie(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), self.scores_partie)
+        enregistrer_partie(self.data, partie, self.leaderboard, self.score_writer)
         
         self.event_log.add_message("Partie terminée ! Cliquez sur REJOUER pour une nouvelle partie.")
         
         
-    def get_random_word(self):
-        try:
-            response = requests.get(self.api_url)
-            if response.status_code == 200:
-                word = response.json()[0]
-                return word
-            else:
-                print(f"Error fetching word: {response.status_code}")
-                return None
-        except Exception as e:
-            print(f"Exception fetching word: {e}")
-            return None
+    def get_random_word(self, niveau=None):
+        return self.words.prendre(niveau)
     
     def start_word_challenge(self):
         self.word_challenge_active = True
-        self.challenge_word = self.get_random_word() or random.choice(self.french_words)
+        # Difficulté du mot calée sur le temps accordé
+        niveau = niveau_pour_delai(self.challenge_time_limit, self.initial_challenge_time_limit)
+        self.challenge_word = self.get_random_word(niveau)
         self.challenge_input = ""
-        self.challenge_timer = pygame.time.get_ticks()
+        self.challenge_timer = self.time
         # Ne pas réinitialiser le temps limite ici, utiliser la valeur actuelle
         self.play_sound("event")
         current_nickname = self.player1_nickname if self.joueur == 1 else self.player2_nickname
@@ -701,7 +769,7 @@ class Game:
         if not self.word_challenge_active:
             return
             
-        elapsed = (pygame.time.get_ticks() - self.challenge_timer) / 1000
+        elapsed = (self.time - self.challenge_timer) / 1000
         time_left = self.challenge_time_limit - elapsed
         
         if time_left <= 0:
@@ -710,10 +778,6 @@ class Game:
             current_nickname = self.player1_nickname if self.joueur == 1 else self.player2_nickname
             self.event_log.add_message(f"Temps écoulé! {current_nickname} n'a pas écrit '{self.challenge_word}' assez rapidement.")
             self.eliminate_current_player()
-            
-            # Réactiver le bouton "TIRER" si le jeu n'est pas terminé
-            if not self.game_over:
-                self.tirer_button.set_active(True)
         elif self.challenge_input.lower() == self.challenge_word.lower():
             self.word_challenge_active = False
             self.challenge_input = ""
@@ -732,11 +796,8 @@ class Game:
             self.challenge_time_limit = max(1, self.challenge_time_limit - 1)  # Ne pas descendre en dessous de 1 seconde
             self.event_log.add_message(f"Temps pour le prochain défi: {self.challenge_time_limit:.1f}s")
     
-        # Mise à jour immédiate de l'affichage
-        self.draw()
-        pygame.display.flip()
-    
     def restart(self):
+        self.timeline.clear()
         self.game_started = False
         self.game_over = False
         self.entering_nicknames = False
@@ -753,6 +814,7 @@ class Game:
         
         self.animations["fade_alpha"] = 0
         self.animations["shake_amount"] = 0
+        self.animations["gun_angle"] = 0
         
         self.challenge_time_limit = self.initial_challenge_time_limit
         self.event_log.add_message(f"Temps de défi réinitialisé à {self.initial_challenge_time_limit} secondes")
@@ -764,7 +826,7 @@ class Game:
     
     def show_classement(self):
         self.play_sound("click")
-        classement = sorted(self.scores.items(), key=lambda x: x[1], reverse=True)
+        classement = self.leaderboard.top()
         messages = ["CLASSEMENT :"]
         
         for joueur, score in classement:
@@ -776,37 +838,134 @@ class Game:
         self.play_sound("click")
         self.event_log.add_message("Options du jeu")
 
+    def get_background(self):
+        # Fond statique (titre, panneaux, arène, libellés) rendu une seule fois
+        # par disposition, puis copié d'un seul blit à chaque image
+        key = (self.entering_nicknames, SCREEN.get_size())
+        if key not in self.backgrounds:
+            self.backgrounds[key] = self.build_background(self.entering_nicknames)
+        return self.backgrounds[key]
+
+    def build_background(self, entering_nicknames):
+        background = pygame.Surface(SCREEN.get_size()).convert()
+        background.fill(DARK_BLUE)
+    
+        shadow_surf = render_text("ROULETTE PAS TRES RUSSE", (0, 0, 0), "Impact", 36)
+        title_surf = render_text("ROULETTE PAS TRES RUSSE", RED, "Impact", 36)
+        background.blit(shadow_surf, (SCREEN_WIDTH // 2 - shadow_surf.get_width() // 2 + 2, 32))
+        background.blit(title_surf, (SCREEN_WIDTH // 2 - title_surf.get_width() // 2, 30))
+    
+        if entering_nicknames:
+            return background
+    
+        # Panneau de contrôles
+        pygame.draw.rect(background, LIGHT_BLUE, pygame.Rect(30, 100, 220, 400), border_radius=10)
+        controls_label = render_text("CONTRÔLES", WHITE, "Arial", 18, bold=True)
+        background.blit(controls_label, (130 - controls_label.get_width() // 2, 110))
+    
+        nb_balles_label = render_text("Nombre de balles (1+):", WHITE, "Arial", 16)
+        background.blit(nb_balles_label, (50, 120))
+    
+        # Zone de jeu
+        pygame.draw.rect(background, LIGHT_BLUE, pygame.Rect(280, 120, 570, 250), border_radius=10)
+        pygame.draw.rect(background, WHITE, pygame.Rect(280, 120, 570, 250), 1, border_radius=10)
+        pygame.draw.ellipse(background, (40, 55, 70), pygame.Rect(350, 210, 430, 120))
+        pygame.draw.ellipse(background, (35, 50, 65), pygame.Rect(350, 210, 430, 120), 2)
+    
+        score_title = render_text("SCORES", ORANGE, "Arial", 16, bold=True)
+        background.blit(score_title, (130 - score_title.get_width() // 2, 505))
+    
+        # Aide
+        help_text = render_text("Flèches ↑/↓: Volume | 0: Musique | →: Musique suivante", WHITE, "Arial", 12)
+        background.blit(help_text, (130 - help_text.get_width() // 2, 580))
+        return background
+
+    def gun_render_state(self):
+        return (self.joueur, tuple(self.gun_rect), self.animations["gun_angle"])
+
+    def gun_bounds(self):
+        width, height = self.gun_image.get_size()
+        if self.animations["gun_angle"] != 0:
+            return rotated_bounds(width, height, self.animations["gun_angle"], self.gun_rect.center)
+        return pygame.Rect(self.gun_rect.topleft, (width, height))
+
+    def indicator_position(self):
+        if not self.game_started or self.game_over:
+            return None
+        player = self.player1 if self.joueur == 1 else self.player2
+        return (player.x, player.y - 80)
+
+    def indicator_render_state(self):
+        pos = self.indicator_position()
+        if pos is None:
+            return None
+        return (pos, 8 + int(4 * (self.time % 1000) / 1000))
+
+    def indicator_bounds(self):
+        pos = self.indicator_position()
+        if pos is None:
+            return None
+        return pygame.Rect(pos[0] - 14, pos[1] - 14, 28, 28)
+
+    def challenge_time_left(self):
+        elapsed = (self.time - self.challenge_timer) / 1000
+        return max(0, self.challenge_time_limit - elapsed)
+
+    def challenge_render_state(self):
+        if not self.word_challenge_active:
+            return None
+        return (self.challenge_word, self.challenge_input, f"{self.challenge_time_left():.1f}")
+
+    def scene_render_state(self):
+        # Tout changement de cet état (écran affiché, tour, scores, effets
+        # plein écran) impose de recomposer toute la fenêtre
+        return (
+            self.entering_nicknames, self.word_challenge_active, self.game_started, self.game_over,
+            self.joueur, self.player1_nickname, self.player2_nickname, tuple(self.scores_partie.items()),
+            bool(self.barillet), self.animations["fade_alpha"], self.animations["shake_amount"]
+        )
+
+    def collect_dirty_rects(self):
+        rects = []
+        for element in self.retained:
+            element.collect_dirty(rects)
+
+        screen_rect = SCREEN.get_rect()
+        scene_state = self.scene_render_state()
+        if self.full_redraw or scene_state != self.scene_state:
+            self.scene_state = scene_state
+            self.full_redraw = False
+            return [screen_rect]
+        if self.word_challenge_active and any(rect.colliderect(self.challenge_box) for rect in rects):
+            # Le contour arrondi du défi, découpé par le clip, ne se redessine
+            # pas à l'identique : une zone touchée sous l'encadré le redessine entier
+            rects.append(self.challenge_box)
+        return [rect.clip(screen_rect) for rect in rects if rect.colliderect(screen_rect)]
+
     def draw(self):
+        # Compose les zones modifiées ; l'affichage se fait une seule fois par
+        # image dans present()
+        dirty_rects = self.collect_dirty_rects()
+        self.profiler.lap("draw.dirty")
+        if not dirty_rects:
+            return
+        self.frame_rects.extend(dirty_rects)
+        SCREEN.set_clip(dirty_rects[0].unionall(dirty_rects[1:]))
+        
         shake_offset_x = random.randint(-self.animations["shake_amount"], self.animations["shake_amount"])
         shake_offset_y = random.randint(-self.animations["shake_amount"], self.animations["shake_amount"])
     
-        SCREEN.fill(DARK_BLUE)
-    
-        title_font = pygame.font.SysFont("Impact", 36)
-        shadow_surf = title_font.render("ROULETTE PAS TRES RUSSE", True, (0, 0, 0))
-        title_surf = title_font.render("ROULETTE PAS TRES RUSSE", True, RED)
-    
-        SCREEN.blit(shadow_surf, (SCREEN_WIDTH // 2 - shadow_surf.get_width() // 2 + 2, 32))
-        SCREEN.blit(title_surf, (SCREEN_WIDTH // 2 - title_surf.get_width() // 2, 30))
+        SCREEN.blit(self.get_background(), (0, 0))
+        self.profiler.lap("draw.bg")
     
         # Dessiner les éléments standard uniquement si nous ne sommes PAS en train d'entrer des pseudos
         if not self.entering_nicknames:
             if self.game_started and not self.game_over:
-                subtitle_font = pygame.font.SysFont("Arial", 24)
                 current_nickname = self.player1_nickname if self.joueur == 1 else self.player2_nickname
                 subtitle_text = f"Tour de {current_nickname}"
-                subtitle_surf = subtitle_font.render(subtitle_text, True, WHITE)
+                subtitle_surf = render_text(subtitle_text, WHITE, "Arial", 24)
                 SCREEN.blit(subtitle_surf, (SCREEN_WIDTH // 2 - subtitle_surf.get_width() // 2, 80))
     
-            # Panneau de contrôles
-            pygame.draw.rect(SCREEN, LIGHT_BLUE, pygame.Rect(30, 100, 220, 400), border_radius=10)
-            controls_label = pygame.font.SysFont("Arial", 18, bold=True).render("CONTRÔLES", True, WHITE)
-            SCREEN.blit(controls_label, (130 - controls_label.get_width() // 2, 110))
-    
-            label_font = pygame.font.SysFont("Arial", 16)
-            nb_balles_label = label_font.render("Nombre de balles (1+):", True, WHITE)
-            SCREEN.blit(nb_balles_label, (50, 120))
-    
             # Afficher la textbox du nombre de balles
             self.nb_balles_textbox.draw(SCREEN)
     
@@ -816,25 +975,16 @@ class Game:
             self.rejouer_button.draw(SCREEN)
             self.music_button.draw(SCREEN)
     
-            # Zone de jeu
-            pygame.draw.rect(SCREEN, LIGHT_BLUE, pygame.Rect(280, 120, 570, 250), border_radius=10)
-            pygame.draw.rect(SCREEN, WHITE, pygame.Rect(280, 120, 570, 250), 1, border_radius=10)
-            pygame.draw.ellipse(SCREEN, (40, 55, 70), pygame.Rect(350, 210, 430, 120))
-            pygame.draw.ellipse(SCREEN, (35, 50, 65), pygame.Rect(350, 210, 430, 120), 2)
-    
             # Joueurs et arme
             self.player1.draw(SCREEN)
             self.player2.draw(SCREEN)
     
-            # Inverser l'image du pistolet horizontalement en fonction du joueur actif
-            if self.joueur == 1:
-                gun_image = self.gun_image
-            else:
-                gun_image = pygame.transform.flip(self.gun_image, True, False)
+            # Image du pistolet (miroir pour le joueur 2) tirée de l'atlas
+            gun_image = self.gun_atlas.get(self.animations["gun_angle"], flipped=self.joueur == 2)
     
             # Dessiner l'image du pistolet
             if self.animations["gun_angle"] != 0:
-                rotated_gun = pygame.transform.rotate(gun_image, self.animations["gun_angle"])
+                rotated_gun = gun_image
                 rotated_rect = rotated_gun.get_rect(center=self.gun_rect.center)
                 SCREEN.blit(rotated_gun, rotated_rect)
             else:
@@ -845,43 +995,32 @@ class Game:
                 indicator_pos = (self.player1.x, self.player1.y - 80) if self.joueur == 1 else (
                 self.player2.x, self.player2.y - 80)
     
-                pulse = (pygame.time.get_ticks() % 1000) / 1000
+                pulse = (self.time % 1000) / 1000
                 pulse_size = 8 + int(4 * pulse)
     
                 pygame.draw.circle(SCREEN, RED, indicator_pos, pulse_size)
                 pygame.draw.circle(SCREEN, WHITE, indicator_pos, pulse_size, 1)
     
             # Scores
-            score_font = pygame.font.SysFont("Arial", 16, bold=True)
-            score_title = score_font.render("SCORES", True, ORANGE)
-            SCREEN.blit(score_title, (130 - score_title.get_width() // 2, 505))
-    
             if self.game_started:
                 score1_color = BLUE if self.joueur == 1 and not self.game_over else WHITE
                 score2_color = RED if self.joueur == 2 and not self.game_over else WHITE
     
-                label_font = pygame.font.SysFont("Arial", 16)
-                score1 = label_font.render(
-                    f"{self.player1_nickname}: {self.scores_partie.get(self.player1_nickname, 0)}", True, score1_color)
-                score2 = label_font.render(
-                    f"{self.player2_nickname}: {self.scores_partie.get(self.player2_nickname, 0)}", True, score2_color)
+                score1 = render_text(
+                    f"{self.player1_nickname}: {self.scores_partie.get(self.player1_nickname, 0)}", score1_color, "Arial", 16)
+                score2 = render_text(
+                    f"{self.player2_nickname}: {self.scores_partie.get(self.player2_nickname, 0)}", score2_color, "Arial", 16)
     
                 SCREEN.blit(score1, (130 - score1.get_width() // 2, 530))
                 SCREEN.blit(score2, (130 - score2.get_width() // 2, 555))
     
-            # Aide
-            help_font = pygame.font.SysFont("Arial", 12)
-            help_text = help_font.render("Flèches ↑/↓: Volume | 0: Musique | →: Musique suivante", True, WHITE)
-            SCREEN.blit(help_text, (130 - help_text.get_width() // 2, 580))
-    
             # Game over
             if self.game_over:
-                go_font = pygame.font.SysFont("Impact", 40)
                 winner_nickname = self.player2_nickname if self.joueur == 1 else self.player1_nickname
                 go_text = "GAME OVER" if not self.barillet else f"{winner_nickname} GAGNE!"
     
-                go_shadow = go_font.render(go_text, True, (0, 0, 0))
-                go_surface = go_font.render(go_text, True, ORANGE)
+                go_shadow = render_text(go_text, (0, 0, 0), "Impact", 40)
+                go_surface = render_text(go_text, ORANGE, "Impact", 40)
     
                 go_x = 280 + 570 // 2 - go_surface.get_width() // 2
                 go_y = 120 + 250 // 2 - go_surface.get_height() // 2
@@ -889,23 +1028,21 @@ class Game:
                 SCREEN.blit(go_shadow, (go_x + 2, go_y + 2))
                 SCREEN.blit(go_surface, (go_x, go_y))
     
+        self.profiler.lap("draw.scene")
+
         # Afficher le panneau de saisie des pseudos (par-dessus tout le reste)
         if self.entering_nicknames:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            SCREEN.blit(overlay, (0, 0))
+            SCREEN.blit(OVERLAYS.get(150, SCREEN.get_size()), (0, 0))
     
             input_box = pygame.Rect(280, 150, 570, 300)
             pygame.draw.rect(SCREEN, DARK_BLUE, input_box, border_radius=10)
             pygame.draw.rect(SCREEN, LIGHT_BLUE, input_box, 2, border_radius=10)
     
-            font = pygame.font.SysFont("Arial", 28, bold=True)
-            title = font.render("ENTREZ VOS PSEUDOS", True, WHITE)
+            title = render_text("ENTREZ VOS PSEUDOS", WHITE, "Arial", 28, bold=True)
             SCREEN.blit(title, (input_box.centerx - title.get_width() // 2, 170))
     
-            font = pygame.font.SysFont("Arial", 20)
-            player1_label = font.render("Joueur 1:", True, BLUE)
-            player2_label = font.render("Joueur 2:", True, RED)
+            player1_label = render_text("Joueur 1:", BLUE, "Arial", 20)
+            player2_label = render_text("Joueur 2:", RED, "Arial", 20)
     
             # Dessiner les noms des joueurs à gauche des zones de texte
             SCREEN.blit(player1_label, (input_box.x + 10, 210))
@@ -921,52 +1058,68 @@ class Game:
     
         # Défi de mot (toujours par-dessus tout)
         if self.word_challenge_active:
-            elapsed = (pygame.time.get_ticks() - self.challenge_timer) / 1000
-            time_left = max(0, self.challenge_time_limit - elapsed)
+            time_left = self.challenge_time_left()
     
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            SCREEN.blit(overlay, (0, 0))
+            SCREEN.blit(OVERLAYS.get(150, SCREEN.get_size()), (0, 0))
     
-            challenge_box = pygame.Rect(280, 150, 570, 200)
+            challenge_box = self.challenge_box
             pygame.draw.rect(SCREEN, DARK_BLUE, challenge_box, border_radius=10)
             pygame.draw.rect(SCREEN, LIGHT_BLUE, challenge_box, 2, border_radius=10)
     
-            font = pygame.font.SysFont("Arial", 22, bold=True)
             current_nickname = self.player1_nickname if self.joueur == 1 else self.player2_nickname
-            instructions = font.render(f"{current_nickname}, TAPEZ CE MOT POUR SURVIVRE:", True, WHITE)
+            instructions = render_text(f"{current_nickname}, TAPEZ CE MOT POUR SURVIVRE:", WHITE, "Arial", 22, bold=True)
             SCREEN.blit(instructions, (challenge_box.centerx - instructions.get_width() // 2, 170))
     
-            word_font = pygame.font.SysFont("Arial", 36, bold=True)
-            word_surf = word_font.render(self.challenge_word, True, ORANGE)
+            word_surf = render_text(self.challenge_word, ORANGE, "Arial", 36, bold=True)
             SCREEN.blit(word_surf, (challenge_box.centerx - word_surf.get_width() // 2, 210))
     
-            input_font = pygame.font.SysFont("Arial", 28)
-            input_surf = input_font.render(self.challenge_input, True, GREEN)
+            input_surf = render_text(self.challenge_input, GREEN, "Arial", 28)
             SCREEN.blit(input_surf, (challenge_box.centerx - input_surf.get_width() // 2, 270))
     
             timer_text = f"Temps restant: {time_left:.1f}s"
-            timer_font = pygame.font.SysFont("Arial", 20)
             timer_color = RED if time_left < 2 else WHITE
-            timer_surf = timer_font.render(timer_text, True, timer_color)
+            timer_surf = render_text(timer_text, timer_color, "Arial", 20)
             SCREEN.blit(timer_surf, (challenge_box.centerx - timer_surf.get_width() // 2, 310))
     
+        self.profiler.lap("draw.panels")
+    
         # Journal d'événements (toujours visible)
         self.event_log.draw(SCREEN)
+        self.profiler.lap("draw.log")
     
         # Effet de fondu
         if self.animations["fade_alpha"] > 0:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, self.animations["fade_alpha"]))
-            SCREEN.blit(overlay, (0, 0))
+            SCREEN.blit(OVERLAYS.get(self.animations["fade_alpha"], SCREEN.get_size()), (0, 0))
     
-        pygame.display.flip()
+        self.profiler.draw_hud(SCREEN)
+        SCREEN.set_clip(None)
+        self.profiler.lap("draw.fx")
+
+    def present(self):
+        if self.offscreen:
+            self.frame_rects = []
+        elif self.frame_rects:
+            pygame.display.update(self.frame_rects)
+            self.frame_rects = []
+
+    def is_animating(self):
+        # Vrai tant qu'il faut la pleine cadence : interpolations, chrono du
+        # défi, transitions de survol des boutons
+        buttons = (self.start_button, self.tirer_button, self.rejouer_button, self.music_button, self.continue_button)
+        return self.timeline.busy() or self.word_challenge_active or any(b.in_transition() for b in buttons)
     
     def handle_event(self, event):
         if event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
         
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.full_redraw = True
+        
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.profiler.toggle()
+            return
+        
         # Gestion prioritaire des saisies spéciales
         if self.entering_nicknames:
             self.player1_nickname_input.handle_event(event)
@@ -974,7 +1127,7 @@ class Game:
             self.continue_button.handle_event(event)
     
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                pos = pygame.mouse.get_pos()
+                pos = event.pos
                 if self.continue_button.is_hovered(pos):
                     self.play_sound("click")
                     self.entering_nicknames = False
@@ -1007,15 +1160,12 @@ class Game:
                     # Réactiver le bouton "TIRER"
                     self.tirer_button.set_active(True)
             
-            # Mise à jour immédiate de l'affichage
-            self.draw()
-            pygame.display.flip()
             return  # Sortir pour ne pas traiter d'autres événements
         
         # Gestion standard des événements
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:
-                pos = pygame.mouse.get_pos()
+                pos = event.pos
                 
                 if self.start_button.is_hovered(pos) and self.start_button.active:
                     self.play_sound("click")
@@ -1049,17 +1199,35 @@ class Game:
         self.event_log.handle_event(event)
 
     def run(self):
-        clock = pygame.time.Clock()
+        pacer = FramePacer(active_fps=60, idle_fps=8)
         
         while True:
-            for event in pygame.event.get():
-                self.handle_event(event)
-            
-            if self.word_challenge_active:
-                self.handle_word_challenge()
-            
-            self.draw()
-            clock.tick(60)
+            dt = pacer.tick(self.is_animating())
+            self.step(dt, pacer.events())
+
+    def game_time(self):
+        return self.time
+
+    def step(self, dt, events=()):
+        # Une image complète. Appelée directement, elle permet de faire tourner
+        # le jeu sans fenêtre en injectant les événements et la durée d'image.
+        self.profiler.begin_frame()
+        self.time += dt
+        
+        for event in events:
+            self.handle_event(event)
+        self.profiler.lap("events")
+        
+        if self.word_challenge_active:
+            self.handle_word_challenge()
+        self.profiler.lap("challenge")
+        
+        self.timeline.update(dt)
+        self.profiler.lap("timeline")
+        self.draw()
+        self.present()
+        self.profiler.lap("present")
+        self.profiler.end_frame()
 
 if __name__ == "__main__":
     game = Game()
@@ -1068,6 +1236,16 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error: {e}")
     finally:
+        game.score_writer.arreter()  # Écrire les scores encore en file avant de quitter
+        game.words.arreter()
+        game.words.client.fermer()
+        if game.profiler.enabled:  # Statistiques de débogage seulement en profilage
+            print(f"Text cache: {TEXT_CACHE.stats()}")
+            print(f"Overlay pool: {OVERLAYS.stats()}")
+            print(f"Assets: {ASSETS.stats}")
+        trace = game.profiler.dump()
+        if trace:
+            print(f"Profil des images: {trace}")
         if pygame.mixer.get_init():  # Vérifiez si le mixer est initialisé
             pygame.mixer.music.stop()
         pygame.quit()
@@ -0,0 +1,488 @@
+import bisect
+import copy
+import gzip
+import json
+import os
+import queue
+import sqlite3
+import threading
+import uuid
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+from contextlib import closing, contextmanager
+from datetime import datetime, timedelta
+
+# Stockage des scores : le fichier JSON historique ({"parties": [...], "scores": {...}})
+# sert d'instantané, et chaque partie terminée est ajoutée en une ligne compacte
+# dans un journal voisin. L'instantané n'est réécrit que tous les SNAPSHOT_INTERVAL
+# parties, en repartant de l'instantané précédent et de la fin du journal.
+
+SNAPSHOT_INTERVAL = 50
+RECENT_PARTIES = 10
+
+# Au-delà de HISTORY_LIMIT parties, seules les HOT_PARTIES dernières restent
+# dans le fichier de scores : les plus anciennes sont archivées (gzip) à côté
+# et résumées en cumuls horaires et journaliers.
+HISTORY_LIMIT = int(os.environ.get("ROULETTE_HISTORY_LIMIT", 1000))
+HOT_PARTIES = int(os.environ.get("ROULETTE_HOT_PARTIES", 200))
+HOURLY_RETENTION_DAYS = 7
+
+# Emplacement unique partagé par main.py, roulette_graphique.py et server.py
+SCORES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web", "scores.json")
+
+# "json" (par défaut) ou "sqlite"
+SCORES_BACKEND = os.environ.get("ROULETTE_SCORES_BACKEND", "json")
+
+
+@contextmanager
+def verrou_fichier(path):
+    # Verrou consultatif inter-processus sur un fichier voisin "<path>.lock"
+    with open(path + ".lock", "a+") as file:
+        if fcntl:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def donnees_vides():
+    return {"parties": [], "scores": {}}
+
+
+def nouvelle_partie(date, scores_partie):
+    return {
+        "id": uuid.uuid4().hex,
+        "date": date,
+        "scores": {str(nickname): score for nickname, score in scores_partie.items()}
+    }
+
+
+def appliquer_partie(data, partie, leaderboard=None):
+    data["parties"].append(partie)
+    scores = data["scores"]
+    for nickname, score in partie["scores"].items():
+        scores[nickname] = scores.get(nickname, 0) + score
+        if leaderboard is not None:
+            leaderboard.add_points(nickname, score)
+
+
+def cumuler_parties(cumuls, parties):
+    for partie in parties:
+        date = partie.get("date", "")
+        for periode, cle in (("heures", date[:13]), ("jours", date[:10])):
+            bucket = cumuls.setdefault(periode, {}).setdefault(cle, {"parties": 0, "points": {}})
+            bucket["parties"] += 1
+            for nickname, score in partie["scores"].items():
+                bucket["points"][nickname] = bucket["points"].get(nickname, 0) + score
+
+    # Les cumuls horaires ne sont gardés que sur les derniers jours
+    heures = cumuls.get("heures", {})
+    try:
+        limite = datetime.strptime(max(heures), "%Y-%m-%d %H") - timedelta(days=HOURLY_RETENTION_DAYS)
+    except ValueError:
+        return
+    limite = limite.strftime("%Y-%m-%d %H")
+    for cle in [cle for cle in heures if cle < limite]:
+        del heures[cle]
+
+
+class Leaderboard:
+    # Classement maintenu trié au fil des parties : une mise à jour déplace
+    # une seule entrée (recherche dichotomique) au lieu de retrier tous les joueurs.
+    def __init__(self, scores=None):
+        self.scores = dict(scores or {})
+        self.entries = sorted((-score, nickname) for nickname, score in self.scores.items())
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add_points(self, nickname, points):
+        old_score = self.scores.get(nickname)
+        if old_score is not None:
+            if points == 0:
+                return
+            del self.entries[bisect.bisect_left(self.entries, (-old_score, nickname))]
+            points += old_score
+        self.scores[nickname] = points
+        bisect.insort(self.entries, (-points, nickname))
+
+    def score(self, nickname):
+        return self.scores.get(nickname)
+
+    def rank(self, nickname):
+        score = self.scores.get(nickname)
+        if score is None:
+            return None
+        return bisect.bisect_left(self.entries, (-score, nickname)) + 1
+
+    def top(self, k=None):
+        entries = self.entries if k is None else self.entries[:k]
+        return [(nickname, -score) for score, nickname in entries]
+
+
+class ScoreStore:
+    def __init__(self, path, snapshot_interval=SNAPSHOT_INTERVAL,
+                 history_limit=HISTORY_LIMIT, hot_parties=HOT_PARTIES):
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + ".journal"
+        self.snapshot_interval = snapshot_interval
+        self.history_limit = history_limit
+        # Il doit rester des parties à archiver une fois la limite dépassée
+        self.hot_parties = max(1, min(hot_parties, history_limit - 1))
+        self.journal_count = 0  # Parties journalisées depuis le dernier instantané
+
+    def charger(self):
+        with verrou_fichier(self.path):
+            return self._charger()
+
+    def _charger(self):
+        data = self._lire_instantane()
+        journal = self._lire_journal()
+
+        # Ignorer les parties déjà intégrées à l'instantané (arrêt entre
+        # l'écriture de l'instantané et la remise à zéro du journal)
+        data.pop("classement", None)  # Écrit par les anciennes versions, dérivé des scores
+        dernier_id = data.pop("dernier_id", None)
+        ids = [partie.get("id") for partie in journal]
+        if dernier_id in ids:
+            journal = journal[ids.index(dernier_id) + 1:]
+
+        for partie in journal:
+            appliquer_partie(data, partie)
+        self.journal_count = len(journal)
+        return data
+
+    def enregistrer_partie(self, partie):
+        self.enregistrer_parties([partie])
+
+    def enregistrer_parties(self, parties):
+        lines = "".join(
+            json.dumps(partie, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for partie in parties
+        )
+        with verrou_fichier(self.path):
+            with open(self.journal_path, "a", encoding="utf-8") as file:
+                file.write(lines)
+            # Le journal peut aussi recevoir les parties d'autres instances
+            self.journal_count = len(self._lire_journal())
+
+            if self.journal_count >= self.snapshot_interval:
+                self._ecrire_instantane(self._charger())
+
+    def importer(self, ancien_path):
+        # Reprise d'un ancien fichier de scores séparé (ex. scores.json de main.py).
+        # Tout se fait sous le verrou, renommage compris : une autre instance
+        # qui démarre en même temps ne trouve plus le fichier à importer.
+        if os.path.abspath(ancien_path) == os.path.abspath(self.path):
+            return
+        with verrou_fichier(self.path):
+            if not os.path.exists(ancien_path):
+                return
+            ancien = ScoreStore(ancien_path)._lire_instantane()
+            if ancien["parties"] or ancien["scores"]:
+                disque = self._charger()
+                for partie in ancien["parties"]:
+                    disque["parties"].append(dict(partie, id=partie.get("id") or uuid.uuid4().hex))
+                for nickname, score in ancien["scores"].items():
+                    disque["scores"][nickname] = disque["scores"].get(nickname, 0) + score
+                self._ecrire_instantane(disque)
+                os.replace(ancien_path, ancien_path + ".importe")
+
+    def _ecrire_instantane(self, data):
+        parties = data["parties"]
+        snapshot = {
+            "parties": parties,
+            "scores": data["scores"]
+        }
+        if "cumuls" in data:
+            snapshot["cumuls"] = data["cumuls"]
+        ids = [partie["id"] for partie in parties if "id" in partie]
+        if ids:
+            snapshot["dernier_id"] = ids[-1]
+
+        if len(parties) > self.history_limit:
+            anciennes = parties[:-self.hot_parties]
+            if anciennes:
+                self._archiver(anciennes)
+                snapshot["parties"] = parties[-self.hot_parties:]
+                snapshot["cumuls"] = copy.deepcopy(data.get("cumuls", {}))
+                cumuler_parties(snapshot["cumuls"], anciennes)
+
+        self._ecrire_atomique(snapshot)
+        open(self.journal_path, "w").close()
+        self.journal_count = 0
+
+    def _archiver(self, parties):
+        horodatage = datetime.now().strftime("%Y%m%d-%H%M%S")
+        archive_path = f"{os.path.splitext(self.path)[0]}-archive-{horodatage}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+        with gzip.open(archive_path, "wt", encoding="utf-8") as file:
+            for partie in parties:
+                file.write(json.dumps(partie, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def compacter(self):
+        with verrou_fichier(self.path):
+            self._ecrire_instantane(self._charger())
+
+    def parties_recentes(self, limit=RECENT_PARTIES):
+        return self.charger()["parties"][-limit:][::-1]
+
+    def _lire_instantane(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                data.setdefault("parties", [])
+                data.setdefault("scores", {})
+                return data
+            except json.JSONDecodeError:
+                print(f"Error reading {self.path}. Creating new score file.")
+        return donnees_vides()
+
+    def _lire_journal(self):
+        parties = []
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        parties.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Dernière ligne tronquée par un arrêt brutal
+                        continue
+        return parties
+
+    def _ecrire_atomique(self, data):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class SQLiteScoreStore:
+    # Même interface que ScoreStore, mais l'historique reste sur disque :
+    # charger() ne lit que les totaux par joueur et les dernières parties.
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS matches (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            uid TEXT NOT NULL UNIQUE,
+            date TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(date);
+        CREATE TABLE IF NOT EXISTS match_scores (
+            match_seq INTEGER NOT NULL REFERENCES matches(seq),
+            position INTEGER NOT NULL,
+            nickname TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            PRIMARY KEY (match_seq, position)
+        );
+        CREATE INDEX IF NOT EXISTS idx_match_scores_nickname ON match_scores(nickname);
+        CREATE TABLE IF NOT EXISTS player_scores (
+            nickname TEXT PRIMARY KEY,
+            total INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_player_scores_total ON player_scores(total DESC);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    def __init__(self, path, snapshot_interval=SNAPSHOT_INTERVAL):
+        # path désigne le fichier JSON historique : la base est créée à côté.
+        # Le JSON n'est que lu (migration unique) et jamais réécrit, pour qu'un
+        # retour au stockage JSON retrouve tout l'historique d'avant la bascule.
+        self.path = path
+        self.db_path = os.path.splitext(path)[0] + ".db"
+        self.snapshot_interval = snapshot_interval
+        self.journal_count = 0
+        # Sous le verrou du JSON : deux instances qui créent la base en même
+        # temps ne migrent l'historique qu'une fois
+        with verrou_fichier(self.path), closing(self._connexion()) as conn, conn:
+            conn.executescript(self.SCHEMA)
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'migration_json'").fetchone() is None:
+                self._migrer_json(conn)
+
+    def _connexion(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def _migrer_json(self, conn):
+        # Reprise unique de l'historique JSON existant (instantané + journal),
+        # verrou déjà pris par l'appelant
+        data = ScoreStore(self.path)._charger()
+        for partie in data["parties"]:
+            self._inserer_partie(conn, partie, cumuler=False)
+        conn.executemany(
+            "INSERT OR REPLACE INTO player_scores (nickname, total) VALUES (?, ?)",
+            data["scores"].items()
+        )
+        conn.execute("INSERT INTO meta (key, value) VALUES ('migration_json', ?)", (self.path,))
+
+    def _inserer_partie(self, conn, partie, cumuler=True):
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO matches (uid, date) VALUES (?, ?)",
+            (partie.get("id") or uuid.uuid4().hex, partie["date"])
+        )
+        if cursor.rowcount == 0:
+            return  # Partie déjà enregistrée
+        seq = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO match_scores (match_seq, position, nickname, score) VALUES (?, ?, ?, ?)",
+            [(seq, i, nickname, score) for i, (nickname, score) in enumerate(partie["scores"].items())]
+        )
+        if cumuler:
+            conn.executemany(
+                "INSERT INTO player_scores (nickname, total) VALUES (?, ?) "
+                "ON CONFLICT(nickname) DO UPDATE SET total = total + excluded.total",
+                partie["scores"].items()
+            )
+
+    def importer(self, ancien_path):
+        # Même verrou que ScoreStore.importer : vérification, import et
+        # renommage ne font qu'un pour les autres instances
+        if os.path.abspath(ancien_path) == os.path.abspath(self.path):
+            return
+        with verrou_fichier(self.path):
+            if not os.path.exists(ancien_path):
+                return
+            ancien = ScoreStore(ancien_path)._lire_instantane()
+            if ancien["parties"] or ancien["scores"]:
+                with closing(self._connexion()) as conn, conn:
+                    for partie in ancien["parties"]:
+                        self._inserer_partie(conn, partie, cumuler=False)
+                    conn.executemany(
+                        "INSERT INTO player_scores (nickname, total) VALUES (?, ?) "
+                        "ON CONFLICT(nickname) DO UPDATE SET total = total + excluded.total",
+                        ancien["scores"].items()
+                    )
+                os.replace(ancien_path, ancien_path + ".importe")
+
+    def charger(self):
+        with closing(self._connexion()) as conn:
+            scores = dict(conn.execute("SELECT nickname, total FROM player_scores"))
+        return {"parties": self.parties_recentes()[::-1], "scores": scores}
+
+    def enregistrer_partie(self, partie):
+        self.enregistrer_parties([partie])
+
+    def enregistrer_parties(self, parties):
+        with closing(self._connexion()) as conn, conn:
+            for partie in parties:
+                self._inserer_partie(conn, partie)
+        self.journal_count += len(parties)
+
+        if self.journal_count >= self.snapshot_interval:
+            self.compacter()
+
+    def compacter(self):
+        # Rien à réécrire : le serveur lit directement la base. On laisse
+        # seulement SQLite mettre à jour ses statistiques d'index.
+        with closing(self._connexion()) as conn:
+            conn.execute("PRAGMA optimize")
+        self.journal_count = 0
+
+    def parties_recentes(self, limit=RECENT_PARTIES):
+        with closing(self._connexion()) as conn:
+            matches = conn.execute(
+                "SELECT seq, uid, date FROM matches ORDER BY seq DESC LIMIT ?", (limit,)
+            ).fetchall()
+            return self._parties(conn, matches)
+
+    def page_parties(self, limit=RECENT_PARTIES, before=None):
+        # Parties de la plus récente à la plus ancienne, en commençant après la
+        # partie `before` : (parties, curseur de la page suivante), None si
+        # `before` est inconnu
+        with closing(self._connexion()) as conn:
+            seq_max = None
+            if before is not None:
+                row = conn.execute("SELECT seq FROM matches WHERE uid = ?", (before,)).fetchone()
+                if row is None:
+                    return None
+                seq_max = row[0]
+            matches = conn.execute(
+                "SELECT seq, uid, date FROM matches WHERE ? IS NULL OR seq < ? ORDER BY seq DESC LIMIT ?",
+                (seq_max, seq_max, limit + 1)
+            ).fetchall()
+            parties = self._parties(conn, matches[:limit])
+        suivant = parties[-1]["id"] if parties and len(matches) > limit else None
+        return parties, suivant
+
+    def parties_joueur(self, nickname, limit=RECENT_PARTIES):
+        # (nombre de parties jouées, dernières parties du joueur)
+        with closing(self._connexion()) as conn:
+            nombre, = conn.execute(
+                "SELECT COUNT(DISTINCT match_seq) FROM match_scores WHERE nickname = ?", (nickname,)
+            ).fetchone()
+            matches = conn.execute(
+                "SELECT seq, uid, date FROM matches WHERE seq IN "
+                "(SELECT match_seq FROM match_scores WHERE nickname = ?) ORDER BY seq DESC LIMIT ?",
+                (nickname, limit)
+            ).fetchall()
+            return nombre, self._parties(conn, matches)
+
+    def _parties(self, conn, matches):
+        parties = []
+        for seq, uid, date in matches:
+            rows = conn.execute(
+                "SELECT nickname, score FROM match_scores WHERE match_seq = ? ORDER BY position", (seq,)
+            )
+            parties.append({"id": uid, "date": date, "scores": dict(rows)})
+        return parties
+
+
+def ouvrir_store(path, backend=None):
+    backend = backend or SCORES_BACKEND
+    if backend == "sqlite":
+        return SQLiteScoreStore(path)
+    return ScoreStore(path)
+
+
+class PersistenceWorker:
+    # Écritures différées sur un thread dédié : la boucle de jeu ne fait que
+    # déposer des copies dans la file, le thread regroupe ce qui s'est accumulé.
+    def __init__(self, store):
+        self.store = store
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="score-persistence", daemon=True)
+        self.thread.start()
+
+    def enregistrer_partie(self, partie):
+        self.queue.put(("partie", copy.deepcopy(partie)))
+
+    def arreter(self, timeout=5):
+        self.queue.put(("arret", None))
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            jobs = [self.queue.get()]
+            while True:
+                try:
+                    jobs.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                self._traiter(jobs)
+            except Exception as e:
+                print(f"Error saving scores: {e}")
+
+            if any(kind == "arret" for kind, _ in jobs):
+                return
+
+    def _traiter(self, jobs):
+        # Les parties accumulées sont ajoutées au stockage en un seul paquet
+        parties = [payload for kind, payload in jobs if kind == "partie"]
+        if parties:
+            self.store.enregistrer_parties(parties)
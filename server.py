@@ -1,14 +1,29 @@
+import email.utils
+import gzip
+import hashlib
 import http.server
-import socketserver
+import json
 import os
+import threading
+import time
+import uuid
 import webbrowser
+from collections import OrderedDict, deque
+from functools import partial
+from urllib.parse import parse_qs, unquote, urlsplit
+from score_store import SCORES_FILE, Leaderboard, ouvrir_store
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Configuration du serveur
 PORT = 8000
 web_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "web")
 os.makedirs(web_dir, exist_ok=True)
 
-# Copie le fichier HTML dans le dossier web
+# Page de secours si web/index.html manque : même tableau de bord, la
+# logique (API, SSE, pagination) reste dans web/scripts.js
 html_content = '''
 <!DOCTYPE html>
 <html lang="fr">
@@ -135,105 +150,456 @@ html_content = '''
     
     <p class="last-update" id="update-time"></p>
     
-    <script>
-        function loadScores() {
-            fetch('scores.json?nocache=' + new Date().getTime())
-                .then(response => response.json())
-                .then(data => {
-                    updateGeneralScores(data.scores);
-                    updateRecentGames(data.parties);
-                    document.getElementById('update-time').textContent = 'Dernière mise à jour: ' + new Date().toLocaleString();
-                })
-                .catch(error => {
-                    console.error('Erreur lors du chargement des scores:', error);
-                    document.getElementById('update-time').textContent = 'Erreur de chargement des scores';
-                });
-        }
-        
-        function updateGeneralScores(scores) {
-            const table = document.getElementById('general-scores');
-            // Conserver uniquement l'en-tête de la table
-            table.innerHTML = '<tr><th>Position</th><th>Joueur</th><th>Score</th></tr>';
-            
-            // Convertir les scores en tableau et trier par score décroissant
-            const sortedScores = Object.entries(scores)
-                .map(([joueur, score]) => ({ joueur, score }))
-                .sort((a, b) => b.score - a.score);
-            
-            // Ajouter chaque ligne au tableau
-            sortedScores.forEach((item, index) => {
-                const row = table.insertRow(-1);
-                row.insertCell(0).textContent = index + 1;
-                // Afficher le vrai nom du joueur ou "Joueur X" pour les anciens scores
-                const displayName = isNaN(item.joueur) ? item.joueur : 'Joueur ' + item.joueur;
-                row.insertCell(1).textContent = displayName;
-                row.insertCell(2).textContent = item.score;
-            });
-        }
-        
-        function updateRecentGames(parties) {
-            const table = document.getElementById('recent-games');
-            // Conserver uniquement l'en-tête de la table
-            table.innerHTML = '<tr><th>Date</th><th>Joueur 1</th><th>Joueur 2</th></tr>';
-            
-            // Prendre les 10 dernières parties
-            const recentGames = parties.slice(-10).reverse();
-            
-            // Ajouter chaque partie au tableau
-            recentGames.forEach(game => {
-                const row = table.insertRow(-1);
-                row.insertCell(0).textContent = game.date;
-                
-                // Trouver les noms des joueurs et leur score
-                const playerKeys = Object.keys(game.scores);
-                
-                // Première cellule joueur
-                const player1Key = playerKeys[0] || '1';
-                const player1Name = isNaN(player1Key) ? player1Key : 'Joueur ' + player1Key;
-                const player1Score = game.scores[player1Key] || 0;
-                row.insertCell(1).textContent = `${player1Name}: ${player1Score}`;
-                
-                // Deuxième cellule joueur
-                const player2Key = playerKeys[1] || '2';
-                const player2Name = isNaN(player2Key) ? player2Key : 'Joueur ' + player2Key;
-                const player2Score = game.scores[player2Key] || 0;
-                row.insertCell(2).textContent = `${player2Name}: ${player2Score}`;
-                
-                // Surligner le gagnant (celui qui a un point)
-                if (player1Score > 0) {
-                    row.cells[1].classList.add('highlight');
-                }
-                if (player2Score > 0) {
-                    row.cells[2].classList.add('highlight');
-                }
-            });
-        }
-        
-        // Charger les scores au chargement de la page
-        document.addEventListener('DOMContentLoaded', loadScores);
-        
-        // Rafraîchir automatiquement les scores toutes les 10 secondes
-        setInterval(loadScores, 10000);
-    </script>
+    <script src="scripts.js"></script>
 </body>
 </html>
 '''
 
-with open(os.path.join(web_dir, "index.html"), "w", encoding="utf-8") as f:
-    f.write(html_content)
+
+# Fichiers du tableau de bord servis depuis un cache compressé
+TYPES_TEXTE = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+    ".json": "application/json; charset=utf-8"
+}
+TAILLE_MIN_COMPRESSION = 256
+REPONSES_MAX = 128  # Réponses JSON gardées en cache (LRU) entre deux rechargements
+
+
+class Ressource:
+    # Corps de réponse figé pour une version donnée ; les variantes gzip/brotli
+    # sont calculées une seule fois, à la première demande.
+    def __init__(self, body, content_type, code=200, last_modified=None):
+        self.code = code
+        self.body = body
+        self.content_type = content_type
+        self.last_modified = last_modified
+        self.etag = '"%s"' % hashlib.sha1(body).hexdigest()[:20]
+        self.variantes = {}
+
+    def encodages(self):
+        if len(self.body) < TAILLE_MIN_COMPRESSION:
+            return ()
+        return ("br", "gzip") if brotli else ("gzip",)
+
+    def encoder(self, encoding):
+        if encoding not in self.variantes:
+            if encoding == "br":
+                self.variantes[encoding] = brotli.compress(self.body)
+            else:
+                self.variantes[encoding] = gzip.compress(self.body, 9)
+        return self.variantes[encoding]
+
+
+class FichiersStatiques:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cache = {}
+
+    def ressource(self, path):
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self.lock:
+            entree = self.cache.get(path)
+            if entree is None or entree[0] != version:
+                with open(path, "rb") as file:
+                    body = file.read()
+                content_type = TYPES_TEXTE[os.path.splitext(path)[1]]
+                entree = (version, Ressource(body, content_type, last_modified=stat.st_mtime))
+                self.cache[path] = entree
+            return entree[1]
+
+
+class ScoresModel:
+    # Modèle en mémoire du fichier de scores, rechargé seulement quand un des
+    # fichiers du stockage change ; les réponses JSON sont mises en cache
+    # jusqu'au rechargement suivant.
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()
+        self.version = None
+        self.last_modified = None
+        self.responses = OrderedDict()
+
+    def fichiers(self):
+        return [path for path in (
+            self.store.path,
+            getattr(self.store, "journal_path", None),
+            getattr(self.store, "db_path", None)
+        ) if path]
+
+    def version_actuelle(self):
+        version = []
+        for path in self.fichiers():
+            try:
+                stat = os.stat(path)
+                version.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                version.append(None)
+        return tuple(version)
+
+    def _date_modification(self, version):
+        dates = [mtime_ns / 1e9 for mtime_ns, _ in filter(None, version)]
+        return max(dates) if dates else None
+
+    def actualiser(self):
+        version = self.version_actuelle()
+        if version == self.version:
+            return
+        data = self.store.charger()
+        parties = data["parties"][::-1]  # Plus récentes d'abord
+        # Curseur de pagination : l'identifiant de la partie, ou son rang
+        # chronologique pour les anciennes parties qui n'en ont pas
+        curseurs = [partie.get("id") or f"#{len(parties) - 1 - i}" for i, partie in enumerate(parties)]
+        positions = {curseur: i for i, curseur in enumerate(curseurs)}
+
+        joueurs = {}
+        for partie in parties:
+            for nickname in partie["scores"]:
+                joueurs.setdefault(nickname, []).append(partie)
+
+        self.leaderboard = self._classement_a_jour(data["scores"], parties, positions)
+        self.classement = self.leaderboard.top()
+        self.parties = parties
+        self.curseurs = curseurs
+        self.positions = positions
+        self.joueurs = joueurs
+        self.responses = OrderedDict()
+        self.version = version
+        self.last_modified = self._date_modification(version)
+
+    def _classement_a_jour(self, scores, parties, positions):
+        # Le classement précédent ne reçoit que les parties ajoutées depuis le
+        # dernier chargement ; s'il ne retombe pas sur les totaux du disque
+        # (import, autre historique), il est reconstruit en entier
+        if self.version is not None and self.curseurs and self.curseurs[0] in positions:
+            leaderboard = self.leaderboard
+            for partie in reversed(parties[:positions[self.curseurs[0]]]):
+                for nickname, score in partie["scores"].items():
+                    leaderboard.add_points(nickname, score)
+            if leaderboard.scores == scores:
+                return leaderboard
+        return Leaderboard(scores)
+
+    def dernier_curseur(self):
+        with self.lock:
+            self.actualiser()
+            return self.curseurs[0] if self.curseurs else None
+
+    def changements(self, curseur):
+        # Parties apparues après `curseur`, de la plus ancienne à la plus
+        # récente ; None si l'historique a changé autrement (rechargement complet)
+        with self.lock:
+            self.actualiser()
+            if not self.curseurs or self.curseurs[0] == curseur:
+                return curseur, []
+            if curseur is None:
+                return self.curseurs[0], self.parties[::-1]
+            if curseur not in self.positions:
+                return self.curseurs[0], None
+            return self.curseurs[0], self.parties[:self.positions[curseur]][::-1]
+
+    def delta(self, partie):
+        nicknames = list(partie["scores"])
+        return {
+            "partie": partie,
+            "classement": [
+                [nickname, self.leaderboard.score(nickname), self.leaderboard.rank(nickname)]
+                for nickname in nicknames
+            ],
+            "joueurs": len(self.classement)
+        }
+
+    def reponse(self, path, query):
+        with self.lock:
+            self.actualiser()
+            cle = self._cle(path, parse_qs(query))
+            ressource = self.responses.get(cle)
+            if ressource is not None:
+                self.responses.move_to_end(cle)
+                return ressource
+            ressource = self._calculer(*cle)
+            # Les erreurs ne sont pas gardées, et seules les REPONSES_MAX
+            # réponses les plus récemment servies restent en mémoire
+            if ressource.code == 200:
+                self.responses[cle] = ressource
+                if len(self.responses) > REPONSES_MAX:
+                    self.responses.popitem(last=False)
+            return ressource
+
+    def _cle(self, path, params):
+        # Clé de cache normalisée : deux requêtes équivalentes (paramètres
+        # inconnus, limite absente ou hors bornes) partagent la même réponse
+        limit = self._entier(params, "limit")
+        if path == "/api/leaderboard":
+            if limit is not None and limit >= len(self.classement):
+                limit = None
+            return path, limit, None
+        if path == "/api/parties":
+            return path, min(limit or 10, 100), params.get("before", [None])[0]
+        if path.startswith("/api/player/"):
+            return "/api/player/", min(limit or 10, 100), unquote(path[len("/api/player/"):])
+        return path, None, None
+
+    def _calculer(self, path, limit, argument):
+        if path == "/api/leaderboard":
+            classement = self.classement if limit is None else self.classement[:limit]
+            return self._json(200, {"classement": classement, "joueurs": len(self.classement)})
+
+        if path == "/api/parties":
+            page = self._page_parties(limit, argument)
+            if page is None:
+                return self._json(404, {"erreur": "Partie inconnue"})
+            parties, suivant = page
+            return self._json(200, {"parties": parties, "suivant": suivant})
+
+        if path == "/api/player/":
+            nickname = argument
+            score = self.leaderboard.score(nickname)
+            if score is None:
+                return self._json(404, {"erreur": "Joueur inconnu"})
+            parties_jouees, parties = self._parties_joueur(nickname, limit)
+            return self._json(200, {
+                "joueur": nickname,
+                "score": score,
+                "position": self.leaderboard.rank(nickname),
+                "parties_jouees": parties_jouees,
+                "dernieres_parties": parties
+            })
+
+        return self._json(404, {"erreur": "Ressource inconnue"})
+
+    def _page_parties(self, limit, before):
+        # La base SQLite garde tout l'historique sur disque, charger() n'en
+        # donne que les dernières parties : la pagination est faite en SQL
+        if hasattr(self.store, "page_parties"):
+            return self.store.page_parties(limit, before)
+        debut = 0
+        if before is not None:
+            if before not in self.positions:
+                return None
+            debut = self.positions[before] + 1
+        parties = self.parties[debut:debut + limit]
+        fin = debut + len(parties)
+        suivant = self.curseurs[fin - 1] if parties and fin < len(self.parties) else None
+        return parties, suivant
+
+    def _parties_joueur(self, nickname, limit):
+        if hasattr(self.store, "parties_joueur"):
+            return self.store.parties_joueur(nickname, limit)
+        parties = self.joueurs.get(nickname, [])
+        return len(parties), parties[:limit]
+
+    @staticmethod
+    def _entier(params, nom):
+        try:
+            return max(0, int(params[nom][0]))
+        except (KeyError, ValueError):
+            return None
+
+    def _json(self, code, payload):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return Ressource(body, TYPES_TEXTE[".json"], code, self.last_modified)
+
+
+class Diffuseur:
+    # Surveille le stockage et diffuse un petit événement SSE par partie terminée.
+    # Chaque événement est sérialisé une seule fois puis écrit tel quel à tous
+    # les clients, qui attendent sur la même condition.
+    INTERVALLE = 0.5
+    HISTORIQUE = 100
+    HEARTBEAT = 15
+    ACTUALISER = b"event: actualiser\ndata: {}\n\n"
+
+    def __init__(self, model):
+        self.model = model
+        self.condition = threading.Condition()
+        self.evenements = deque(maxlen=self.HISTORIQUE)  # (id, octets)
+        self.dernier_id = 0
+        # Les ids envoyés sont préfixés par un jeton propre à ce démarrage :
+        # un id venu d'un serveur précédent n'est jamais pris pour un id récent
+        self.jeton = uuid.uuid4().hex[:8]
+
+    def analyser_id(self, last_event_id):
+        # Numéro d'événement de ce démarrage, ou None s'il est inconnu
+        jeton, _, numero = (last_event_id or "").partition("-")
+        if jeton != self.jeton or not numero.isdigit():
+            return None
+        return int(numero)
+
+    def demarrer(self):
+        self.curseur = self.model.dernier_curseur()
+        threading.Thread(target=self._surveiller, name="sse-watcher", daemon=True).start()
+
+    def _surveiller(self):
+        while True:
+            try:
+                self.curseur, changements = self.model.changements(self.curseur)
+                if changements is None:
+                    self.publier("actualiser", {})
+                else:
+                    for partie in changements:
+                        self.publier("partie", self.model.delta(partie))
+            except Exception as e:
+                print(f"Erreur de surveillance des scores : {e}")
+            time.sleep(self.INTERVALLE)
+
+    def publier(self, event, payload):
+        with self.condition:
+            self.dernier_id += 1
+            data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+            message = f"id: {self.jeton}-{self.dernier_id}\nevent: {event}\ndata: {data}\n\n".encode("utf-8")
+            self.evenements.append((self.dernier_id, message))
+            self.condition.notify_all()
+
+    def attendre(self, depuis):
+        # Renvoie les messages d'id > depuis, ou [] après HEARTBEAT secondes
+        with self.condition:
+            if depuis > self.dernier_id:
+                # Id d'un autre démarrage du serveur : le client recharge tout
+                return self.dernier_id, [self.ACTUALISER]
+            self.condition.wait_for(lambda: self.dernier_id > depuis, timeout=self.HEARTBEAT)
+            if self.evenements and depuis < self.evenements[0][0] - 1:
+                # Client trop en retard : il recharge tout
+                return self.dernier_id, [self.ACTUALISER]
+            return self.dernier_id, [message for event_id, message in self.evenements if event_id > depuis]
+
+
+class RouletteHandler(http.server.SimpleHTTPRequestHandler):
+    model = None
+    diffuseur = None
+    statiques = FichiersStatiques()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/events":
+            self.flux_evenements()
+            return
+        if url.path.startswith("/api/"):
+            self.envoyer(self.model.reponse(url.path, url.query))
+            return
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if os.path.splitext(path)[1] in TYPES_TEXTE and os.path.isfile(path):
+            self.envoyer(self.statiques.ressource(path))
+        else:
+            super().do_GET()
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def flux_evenements(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        last_event_id = self.headers.get("Last-Event-ID")
+        depuis = self.diffuseur.analyser_id(last_event_id)
+        debut = b"retry: 3000\n\n"
+        if depuis is None:
+            depuis = self.diffuseur.dernier_id
+            if last_event_id:
+                # Reconnexion après un redémarrage : rien à rejouer, tout recharger
+                debut += Diffuseur.ACTUALISER
+        try:
+            self.wfile.write(debut)
+            self.wfile.flush()
+            while True:
+                depuis, messages = self.diffuseur.attendre(depuis)
+                self.wfile.write(b"".join(messages) or b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client déconnecté
+
+    def non_modifie(self, ressource):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            etags = [etag.strip() for etag in if_none_match.split(",")]
+            return "*" in etags or ressource.etag in etags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and ressource.last_modified is not None:
+            try:
+                date = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+            return int(ressource.last_modified) <= date.timestamp()
+        return False
+
+    def choisir_encodage(self, ressource):
+        acceptes = {
+            token.split(";")[0].strip()
+            for token in self.headers.get("Accept-Encoding", "").split(",")
+            if "q=0" not in token.replace(" ", "").split(";")[1:]
+        }
+        for encoding in ressource.encodages():
+            if encoding in acceptes:
+                return encoding
+        return None
+
+    def envoyer(self, ressource):
+        if ressource.code == 200 and self.non_modifie(ressource):
+            self.send_response(304)
+            self.entetes_cache(ressource)
+            self.end_headers()
+            return
+
+        encoding = self.choisir_encodage(ressource)
+        body = ressource.encoder(encoding) if encoding else ressource.body
+        self.send_response(ressource.code)
+        self.send_header("Content-Type", ressource.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.entetes_cache(ressource)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def entetes_cache(self, ressource):
+        # Les navigateurs revalident à chaque appel (no-cache) mais ne
+        # retéléchargent que si la version a changé
+        self.send_header("ETag", ressource.etag)
+        if ressource.last_modified is not None:
+            self.send_header("Last-Modified", email.utils.formatdate(ressource.last_modified, usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format, *args):
+        # Les écrans muraux interrogent l'API en continu : ne journaliser que les erreurs
+        pass
+
+    def log_error(self, format, *args):
+        super().log_message(format, *args)
+
+
+# Ne pas écraser le tableau de bord existant (web/index.html + scripts.js)
+index_path = os.path.join(web_dir, "index.html")
+if not os.path.exists(index_path):
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(html_content)
+
+RouletteHandler.model = ScoresModel(ouvrir_store(SCORES_FILE))
+RouletteHandler.diffuseur = Diffuseur(RouletteHandler.model)
+RouletteHandler.diffuseur.demarrer()
+
+# Chaque client SSE garde un thread en attente : une petite pile suffit et
+# permet d'en garder des centaines ouverts
+threading.stack_size(256 * 1024)
 
 print(f"Serveur web démarré sur http://localhost:{PORT}")
 print("Ouvrez votre navigateur à cette adresse pour voir les scores")
 
-# Changer le répertoire de travail pour le dossier web
-os.chdir(web_dir)
-
 # Ouvrir automatiquement le navigateur
 webbrowser.open(f'http://localhost:{PORT}')
 
-# Démarrer le serveur HTTP
-with socketserver.TCPServer(("", PORT), http.server.SimpleHTTPRequestHandler) as httpd:
+# Démarrer le serveur HTTP (un thread par requête)
+handler = partial(RouletteHandler, directory=web_dir)
+with http.server.ThreadingHTTPServer(("", PORT), handler) as httpd:
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
-        print("Serveur arrêté.")
\ No newline at end of file
+        print("Serveur arrêté.")
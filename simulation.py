@@ -0,0 +1,138 @@
+import sys
+import time
+
+import numpy as np
+
+# Simulateur Monte Carlo des parties, par lots vectorisés avec NumPy, pour
+# régler nb_balles et le chrono du défi sans jouer les parties une à une.
+#
+# Règles reprises du jeu : le joueur 1 tire en premier et les joueurs
+# alternent à chaque tir. Une chambre chargée déclenche un défi de mot,
+# réussi avec la probabilité `survie` ; un échec élimine le tireur. La partie
+# s'arrête sans éliminé quand le barillet est vide. Au-delà de 6 balles, le
+# barillet enchaîne comme start_game_with_nicknames() des blocs
+# init_barillet(6), entièrement chargés, puis un dernier bloc de 6 chambres
+# contenant le reste des balles.
+#
+# `survie` est une probabilité unique ou une suite indexée par le numéro du
+# défi (0 pour le premier) ; la dernière valeur vaut pour les défis suivants.
+
+BLOCK = 6
+DEFAULT_BATCH = 1 << 18
+
+
+def decomposer(nb_balles):
+    # (chambres chargées d'avance, balles du dernier bloc ou None s'il n'y en a pas)
+    if nb_balles <= BLOCK:
+        return 0, nb_balles
+    pleins, reste = divmod(nb_balles, BLOCK)
+    return pleins * BLOCK, (reste or None)
+
+
+def nb_chambres(nb_balles):
+    prefixe, reste = decomposer(nb_balles)
+    return prefixe + (BLOCK if reste is not None else 0)
+
+
+def probabilites_survie(survie, nb_defis):
+    survie = np.atleast_1d(np.asarray(survie, dtype=np.float64))
+    if len(survie) < nb_defis:
+        survie = np.concatenate([survie, np.full(nb_defis - len(survie), survie[-1])])
+    return np.clip(survie[:nb_defis], 0, 1)
+
+
+def simuler_lot(nb_balles, survie, taille, rng):
+    # Index (à partir de 0) du tir fatal de chaque partie, -1 sans éliminé
+    prefixe, reste = decomposer(nb_balles)
+    chambres = nb_chambres(nb_balles)
+    p = probabilites_survie(survie, chambres)
+    fatal = np.full(taille, -1, dtype=np.int64)
+
+    if prefixe:
+        # Chambres toutes chargées : le défi n°k tombe au tir n°k. La partie
+        # survit aux k+1 premiers tirs avec la probabilité S_k = p_0...p_k, on
+        # tire donc u uniforme et le tir fatal est le premier k où S_k < u.
+        cumul = np.cumprod(p[:prefixe])
+        index = np.searchsorted(-cumul, -rng.random(taille), side="right")
+        elimine = index < prefixe
+        fatal[elimine] = index[elimine]
+
+    if reste is not None:
+        encore = np.flatnonzero(fatal < 0)
+        n = len(encore)
+        if n:
+            # Barillets mélangés : un rang aléatoire par chambre, les `reste`
+            # plus petits rangs sont chargés
+            charge = np.argsort(rng.random((n, BLOCK)), axis=1) < reste
+            rang = prefixe + np.cumsum(charge, axis=1) - 1  # Numéro du défi à chaque chambre
+            p_defi = p[np.clip(rang, 0, chambres - 1)]
+            mort = charge & (rng.random((n, BLOCK)) >= p_defi)
+            touche = mort.any(axis=1)
+            fatal[encore[touche]] = prefixe + mort[touche].argmax(axis=1)
+    return fatal
+
+
+class Resultats:
+    def __init__(self, nb_balles, chambres):
+        self.nb_balles = nb_balles
+        self.parties = 0
+        self.sans_elimine = 0
+        self.par_tir = np.zeros(chambres, dtype=np.int64)  # Éliminations par index de tir
+        self.duree = 0.0
+
+    def ajouter(self, fatal):
+        self.parties += len(fatal)
+        touches = fatal[fatal >= 0]
+        self.sans_elimine += len(fatal) - len(touches)
+        self.par_tir += np.bincount(touches, minlength=len(self.par_tir))
+
+    def par_joueur(self):
+        # Tirs pairs : joueur 1, tirs impairs : joueur 2
+        return {1: int(self.par_tir[0::2].sum()), 2: int(self.par_tir[1::2].sum())}
+
+    def resume(self):
+        eliminations = self.par_joueur()
+        return {
+            "nb_balles": self.nb_balles,
+            "parties": self.parties,
+            "elimine": {joueur: n / self.parties for joueur, n in eliminations.items()},
+            "sans_elimine": self.sans_elimine / self.parties,
+            "tir_moyen": float((np.arange(len(self.par_tir)) + 1) @ self.par_tir / max(1, self.par_tir.sum())),
+            "parties_par_seconde": self.parties / self.duree if self.duree else None,
+        }
+
+    def rapport(self, tirs=12):
+        resume = self.resume()
+        lignes = [
+            f"{self.parties} parties, {self.nb_balles} balle(s), {len(self.par_tir)} chambre(s)",
+            f"Joueur 1 éliminé : {resume['elimine'][1]:.4%}",
+            f"Joueur 2 éliminé : {resume['elimine'][2]:.4%}",
+            f"Barillet vidé sans éliminé : {resume['sans_elimine']:.4%}",
+            f"Tir fatal moyen : {resume['tir_moyen']:.2f}",
+        ]
+        for index, n in enumerate(self.par_tir[:tirs]):
+            lignes.append(f"  tir {index + 1:>3} (joueur {index % 2 + 1}) : {n / self.parties:.4%}")
+        if resume["parties_par_seconde"]:
+            lignes.append(f"{resume['parties_par_seconde']:,.0f} parties/s")
+        return "\n".join(lignes)
+
+
+def simuler(nb_balles, survie=0.5, parties=1_000_000, lot=DEFAULT_BATCH, graine=None):
+    rng = np.random.default_rng(graine)
+    resultats = Resultats(nb_balles, nb_chambres(nb_balles))
+    debut = time.perf_counter()
+    restantes = parties
+    while restantes > 0:
+        taille = min(lot, restantes)
+        resultats.ajouter(simuler_lot(nb_balles, survie, taille, rng))
+        restantes -= taille
+    resultats.duree = time.perf_counter() - debut
+    return resultats
+
+
+if __name__ == "__main__":
+    # python simulation.py [nb_balles] [survie] [parties]
+    nb_balles = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    survie = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    parties = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000_000
+    print(simuler(nb_balles, survie, parties).rapport())
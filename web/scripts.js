@@ -1,10 +1,31 @@
+function fetchJson(url) {
+    // 'no-cache' : le navigateur renvoie ETag/Last-Modified et le serveur
+    // répond 304 sans corps tant que les scores n'ont pas changé
+    return fetch(url, { cache: 'no-cache' }).then(response => {
+        if (!response.ok) {
+            throw new Error(url + ' : ' + response.status);
+        }
+        return response.json();
+    });
+}
+
+// Dernier état affiché, mis à jour par les événements du serveur
+let currentClassement = [];
+let recentParties = [];
+
+function showUpdateTime() {
+    document.getElementById('update-time').textContent = 'Dernière mise à jour: ' + new Date().toLocaleString();
+}
+
 function loadScores() {
-    fetch('scores.json?nocache=' + new Date().getTime())
-        .then(response => response.json())
-        .then(data => {
-            updateGeneralScores(data.scores);
-            updateRecentGames(data.parties);
-            document.getElementById('update-time').textContent = 'Dernière mise à jour: ' + new Date().toLocaleString();
+    // Le serveur renvoie le classement déjà trié et seulement les 10 dernières parties
+    Promise.all([fetchJson('api/leaderboard'), fetchJson('api/parties?limit=10')])
+        .then(([leaderboard, recent]) => {
+            currentClassement = leaderboard.classement;
+            recentParties = recent.parties;
+            updateGeneralScores(currentClassement);
+            updateRecentGames(recentParties);
+            showUpdateTime();
         })
         .catch(error => {
             console.error('Erreur lors du chargement des scores:', error);
@@ -12,22 +33,17 @@ function loadScores() {
         });
 }
 
-function updateGeneralScores(scores) {
+function updateGeneralScores(classement) {
     const table = document.getElementById('general-scores');
     // Conserver uniquement l'en-tête de la table
     table.innerHTML = '<tr><th>Position</th><th>Joueur</th><th>Score</th></tr>';
     
-    // Convertir les scores en tableau et trier par score décroissant
-    const sortedScores = Object.entries(scores)
-        .map(([joueur, score]) => ({ joueur, score }))
-        .sort((a, b) => b.score - a.score);
-    
     // Ajouter chaque ligne au tableau
-    sortedScores.forEach((item, index) => {
+    classement.forEach(([joueur, score], index) => {
         const row = table.insertRow(-1);
         row.insertCell(0).textContent = index + 1;
-        row.insertCell(1).textContent = item.joueur;
-        row.insertCell(2).textContent = item.score;
+        row.insertCell(1).textContent = joueur;
+        row.insertCell(2).textContent = score;
     });
 }
 
@@ -36,8 +52,8 @@ function updateRecentGames(parties) {
     // Conserver uniquement l'en-tête de la table
     table.innerHTML = '<tr><th>Date</th><th>Joueur 1</th><th>Joueur 2</th></tr>';
     
-    // Prendre les 10 dernières parties
-    const recentGames = parties.slice(-10).reverse();
+    // Les parties arrivent de la plus récente à la plus ancienne
+    const recentGames = parties.slice(0, 10);
     
     // Ajouter chaque partie au tableau
     recentGames.forEach(game => {
@@ -74,8 +90,55 @@ function updateRecentGames(parties) {
     });
 }
 
-// Charger les scores au chargement de la page
-document.addEventListener('DOMContentLoaded', loadScores);
+function applyDelta(delta) {
+    // Seuls les joueurs de la partie changent de place : on les retire puis on
+    // les réinsère à la position calculée par le serveur
+    const changed = new Set(delta.classement.map(([joueur]) => joueur));
+    currentClassement = currentClassement.filter(([joueur]) => !changed.has(joueur));
+    delta.classement
+        .slice()
+        .sort((a, b) => a[2] - b[2])
+        .forEach(([joueur, score, position]) => currentClassement.splice(position - 1, 0, [joueur, score]));
+
+    recentParties = [delta.partie].concat(recentParties).slice(0, 10);
+    updateGeneralScores(currentClassement);
+    updateRecentGames(recentParties);
+    showUpdateTime();
+}
+
+// Interrogation périodique, seulement quand le flux d'événements est coupé
+let pollTimer = null;
+
+function startPolling() {
+    if (pollTimer === null) {
+        pollTimer = setInterval(loadScores, 10000);
+    }
+}
+
+function stopPolling() {
+    if (pollTimer !== null) {
+        clearInterval(pollTimer);
+        pollTimer = null;
+    }
+}
+
+function subscribeToEvents() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    const source = new EventSource('events');
+    source.onopen = () => {
+        stopPolling();
+        loadScores();  // Rattraper ce qui a pu être manqué pendant la coupure
+    };
+    source.onerror = () => startPolling();
+    source.addEventListener('partie', event => applyDelta(JSON.parse(event.data)));
+    source.addEventListener('actualiser', loadScores);
+}
 
-// Rafraîchir automatiquement les scores toutes les 10 secondes
-setInterval(loadScores, 10000);
\ No newline at end of file
+// Charger les scores au chargement de la page puis suivre les mises à jour en direct
+document.addEventListener('DOMContentLoaded', () => {
+    loadScores();
+    subscribeToEvents();
+});